@@ -1,14 +1,23 @@
+from collections.abc import Callable
+from functools import cache
+
 import ee
 
-# Dictionary of predefined areas of interest
-AREAS: dict[str, ee.Geometry] = {
-    "finland": ee.FeatureCollection("FAO/GAUL/2015/level0")
-    .filter(ee.Filter.eq("ADM0_NAME", "Finland"))
-    .geometry(),
+# Dictionary of predefined areas of interest. An entry is either a geometry or
+# a zero-argument callable that builds it on first use, which lets entries
+# defined here avoid needing ee.Initialize() to have run at import time. The
+# annotation is quoted so the ee types are not evaluated at import time either.
+AREAS: "dict[str, ee.Geometry | Callable[[], ee.Geometry]]" = {
+    "finland": lambda: (
+        ee.FeatureCollection("FAO/GAUL/2015/level0")
+        .filter(ee.Filter.eq("ADM0_NAME", "Finland"))
+        .geometry()
+    ),
     # Add more areas as needed
 }
 
 
+@cache
 def get_area(name: str) -> ee.Geometry:
     """
     Get area of interest by name.
@@ -26,4 +35,31 @@ def get_area(name: str) -> ee.Geometry:
         raise ValueError(
             f"Area '{name}' not found. Available areas: {list(AREAS.keys())}",
         )
-    return AREAS[name]
+    entry = AREAS[name]
+    return entry() if callable(entry) else entry
+
+
+@cache
+def get_area_bounds_coords(name: str) -> list | None:
+    """
+    Get the bounding box coordinates of an area of interest by name.
+
+    The bounds are fetched from Earth Engine once per area and cached, since
+    each lookup is a synchronous server round-trip.
+
+    Args:
+        name: Name of the predefined area
+
+    Returns:
+        List of coordinates defining the area bounds, or None if Earth Engine
+        returned no bounds
+
+    Raises:
+        ValueError: If the specified area name is not found
+    """
+    bounds_info = get_area(name).bounds().getInfo()
+
+    if bounds_info is None:
+        return None
+
+    return bounds_info["coordinates"]
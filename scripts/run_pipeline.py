@@ -3,20 +3,50 @@
 Run the geospatial metrics pipeline with modular steps.
 """
 
+import fnmatch
+import json
 import logging
 import os
+import re
 import sys
 from enum import Enum
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+# Root help text, printed without importing Typer. Keep in sync with the
+# command docstrings below.
+_STATIC_HELP = """\
+Usage: run_pipeline.py [OPTIONS] COMMAND [ARGS]...
+
+  Remote sensing analysis pipeline
+
+Options:
+  --install-completion  Install completion for the current shell.
+  --show-completion     Show completion for the current shell, to copy it or
+                        customize the installation.
+  --help                Show this message and exit.
+
+Commands:
+  full        Run the full pipeline from data extraction to statistics
+              generation.
+  extract     Extract and process satellite data without generating
+              statistics.
+  statistics  Generate statistics from existing GeoTIFF files.
+"""
+
+if __name__ == "__main__" and sys.argv[1:] == ["--help"]:
+    print(_STATIC_HELP, end="")
+    sys.exit(0)
 
-import typer
-import yaml
+import typer  # noqa: E402
 
 # Add the project root to Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, project_root)
 
-from src.pipeline.runner import Pipeline  # noqa: E402
+if TYPE_CHECKING:
+    from src.pipeline.runner import Pipeline
 
 
 class LogLevel(str, Enum):
@@ -30,6 +60,17 @@ class LogLevel(str, Enum):
 
 app = typer.Typer(help="Remote sensing analysis pipeline")
 
+logger = logging.getLogger(__name__)
+
+# Common vegetation and moisture indices that can appear in GeoTIFF filenames,
+# in the order they take precedence when a filename contains several
+METRICS = ("EVI", "LAI", "MSI", "NDVI", "NDWI")
+METRIC_PATTERN = re.compile("|".join(METRICS))
+
+# Metric suffix of the GeoTIFF filenames written by the pipeline, so area
+# names or prefixes containing an index name are not mistaken for it
+METRIC_SUFFIX_PATTERN = re.compile(rf"_({'|'.join(METRICS)})\.tif$")
+
 
 def setup_logging(log_level: LogLevel) -> None:
     """Configure logging.
@@ -43,17 +84,137 @@ def setup_logging(log_level: LogLevel) -> None:
     )
 
 
+@cache
+def _get_pipeline_cls() -> type["Pipeline"]:
+    """Import the Pipeline class on first use.
+
+    The pipeline pulls in Earth Engine, httpx and the statistics stack, so
+    importing it lazily keeps ``--help`` and argument errors fast.
+
+    Returns:
+        The Pipeline class
+    """
+    from src.pipeline.runner import Pipeline
+
+    return Pipeline
+
+
+@cache
+def _get_yaml_loader() -> Any:
+    """Return the fastest available safe YAML loader.
+
+    Returns:
+        The LibYAML C loader if available, otherwise the pure-Python loader
+    """
+    try:
+        from yaml import CSafeLoader
+
+        return CSafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+        return SafeLoader
+
+
 def load_config(config_path: Path) -> dict:
     """Load configuration from a YAML file.
 
+    The parsed configuration is cached in a JSON sidecar next to the YAML
+    file and reused as long as the YAML file's modification time and size
+    are unchanged. Configurations that JSON cannot represent exactly, such
+    as ones with non-string keys, are not cached.
+
     Args:
         config_path: Path to the configuration file
 
     Returns:
         Configuration dictionary
     """
+    config_path = Path(config_path)
+    cache_path = config_path.with_suffix(".yaml.cache.json")
+
+    config_stat = config_path.stat()
+    source = [config_stat.st_mtime_ns, config_stat.st_size]
+
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        # Compare for equality, since a replaced file can be older than the cache
+        if cached["source"] == source:
+            return cached["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    import yaml
+
     with open(config_path) as f:
-        return yaml.safe_load(f)
+        config = yaml.load(f, Loader=_get_yaml_loader())
+
+    # Write the cache atomically; failing to cache is never fatal
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        serialized = json.dumps({"source": source, "config": config})
+        if json.loads(serialized)["config"] != config:
+            raise ValueError("configuration does not round-trip through JSON")
+        with open(tmp_path, "w") as f:
+            f.write(serialized)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not cache config {config_path} to {cache_path}: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+    return config
+
+
+def metric_from_filename(filename: str) -> str | None:
+    """Identify the metric a GeoTIFF file holds from its name.
+
+    The ``_<METRIC>.tif`` suffix written by the pipeline takes precedence.
+    Otherwise the metric name may appear anywhere in the filename, and the
+    first of METRICS found is used.
+
+    Args:
+        filename: Name of the GeoTIFF file
+
+    Returns:
+        Name of the metric, or None if the filename contains none
+    """
+    if match := METRIC_SUFFIX_PATTERN.search(filename):
+        return match.group(1)
+
+    found = METRIC_PATTERN.findall(filename)
+    return min(found, key=METRICS.index) if found else None
+
+
+def find_files(directory: Path, pattern: str) -> list[Path]:
+    """Find files in a directory whose names match a glob pattern.
+
+    Simple patterns are matched against ``os.scandir`` entry names, so Path
+    objects are only built for matching files. Recursive or nested patterns
+    fall back to ``Path.glob``.
+
+    Args:
+        directory: Directory to search
+        pattern: Glob pattern to match file names against
+
+    Returns:
+        List of matching file paths
+    """
+    if "**" in pattern or "/" in pattern or os.sep in pattern:
+        return list(directory.glob(pattern))
+
+    # Match case-sensitively, like Path.glob on POSIX
+    name_matches = re.compile(fnmatch.translate(pattern)).match
+
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if name_matches(entry.name) and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
 
 
 @app.callback()
@@ -103,7 +264,7 @@ def full(
         config_dict["start_date"] = start_date
 
     # Run pipeline
-    pipeline = Pipeline(config_dict)
+    pipeline = _get_pipeline_cls()(config_dict)
     _ = pipeline.run()
 
     logging.info("Full pipeline completed successfully")
@@ -153,7 +314,7 @@ def extract(
     config_dict["statistics"] = {"enabled": False}
 
     # Run pipeline
-    pipeline = Pipeline(config_dict)
+    pipeline = _get_pipeline_cls()(config_dict)
     _ = pipeline.run()
 
     logging.info("Data extraction and processing completed successfully")
@@ -217,7 +378,7 @@ def statistics(
 
     # Load existing GeoTIFF files
     input_directory = Path(config_dict["output"]["directory"])
-    geotiff_files = list(input_directory.glob(pattern))
+    geotiff_files = find_files(input_directory, pattern)
 
     if not geotiff_files:
         logging.error(
@@ -229,19 +390,16 @@ def statistics(
     logging.info(f"Found {len(geotiff_files)} GeoTIFF files")
 
     # Initialize pipeline and manually run statistics step
-    pipeline = Pipeline(config_dict)
+    pipeline = _get_pipeline_cls()(config_dict)
 
     # Extract metric name from file and build dictionary
     saved_files = {}
     for file_path in geotiff_files:
         # Try to extract metric from filename
-        filename = file_path.name
-        # Simple parsing: look for common vegetation indices
-        for metric in ["EVI", "LAI", "MSI", "NDVI", "NDWI"]:
-            if metric in filename:
-                saved_files[metric] = file_path
-                logging.info(f"Loaded {metric} from {file_path}")
-                break
+        metric = metric_from_filename(file_path.name)
+        if metric:
+            saved_files[metric] = file_path
+            logging.info(f"Loaded {metric} from {file_path}")
 
     if not saved_files:
         logging.error("Could not identify metrics in the filenames")
@@ -253,5 +411,10 @@ def statistics(
     logging.info("Statistics generation completed successfully")
 
 
-if __name__ == "__main__":
+def main() -> None:
+    """Run the command line interface."""
     app()
+
+
+if __name__ == "__main__":
+    main()
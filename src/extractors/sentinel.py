@@ -1,21 +1,34 @@
 import ee
 
+from src.processors.preprocessing import mask_clouds
+
+# Sentinel-2 bands needed by the metrics, plus the QA band for cloud masking
+SENTINEL_BANDS = ["B2", "B4", "B8", "B11"]
+QA_BAND = "QA60"
+
 
 def get_sentinel_data(
     start_date: ee.Date,
     end_date: ee.Date,
     area: ee.Geometry,
+    max_cloud_percentage: float = 30,
+    cloud_masking: bool = True,
 ) -> ee.ImageCollection:
     """
     Extract Sentinel-2 data for the specified time range and area.
 
+    Only the bands required by the metrics are kept, and cloudy pixels are
+    masked server-side before any further processing.
+
     Args:
         start_date: Start date for data collection
         end_date: End date for data collection
         area: Area of interest
+        max_cloud_percentage: Maximum scene cloud cover to keep an image
+        cloud_masking: Whether to mask cloudy pixels using the QA60 band
 
     Returns:
-        ee.ImageCollection: Collection of Sentinel-2 images
+        ee.ImageCollection: Collection of cloud-masked Sentinel-2 images
     """
     # Get the Sentinel-2 image collection
     collection = (
@@ -24,7 +37,14 @@ def get_sentinel_data(
         .filterBounds(area)
     )
 
-    # Apply cloud filtering if configured (can be extended based on config)
-    collection = collection.filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 30))
+    # Drop mostly cloudy scenes using metadata before any per-pixel work
+    collection = collection.filter(
+        ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", max_cloud_percentage),
+    )
+
+    # Drop unused bands early, then mask remaining cloudy pixels per image
+    collection = collection.select([*SENTINEL_BANDS, QA_BAND])
+    if cloud_masking:
+        collection = collection.map(mask_clouds)
 
     return collection
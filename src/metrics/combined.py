@@ -0,0 +1,95 @@
+from collections.abc import Collection
+
+import ee
+
+# Metric bands calculate_metrics can add, in the order they are added
+METRIC_BANDS = ("EVI", "LAI", "MSI")
+
+# Sentinel-2 bands each metric is calculated from
+METRIC_INPUT_BANDS = {
+    "EVI": ("B2", "B4", "B8"),
+    "LAI": ("B2", "B4", "B8"),
+    "MSI": ("B8", "B11"),
+}
+
+
+def get_required_bands(metrics: Collection[str]) -> list[str]:
+    """
+    Get the Sentinel-2 bands needed to calculate the given metrics.
+
+    Selecting only these bands before mapping `calculate_metrics` keeps Earth
+    Engine from reading bands that no metric uses.
+
+    Args:
+        metrics: Names of the metrics to calculate
+
+    Returns:
+        Names of the required input bands, without duplicates
+    """
+    return list(
+        dict.fromkeys(
+            band
+            for metric in METRIC_BANDS
+            if metric in metrics
+            for band in METRIC_INPUT_BANDS[metric]
+        ),
+    )
+
+
+def get_metric_band_names(metrics: Collection[str]) -> list[str]:
+    """
+    Get the names of the bands `calculate_metrics` adds for the given metrics.
+
+    The bands follow directly from the requested metrics, so callers can know
+    them without asking Earth Engine for the image's band names.
+
+    Args:
+        metrics: Names of the metrics to calculate
+
+    Returns:
+        Names of the metric bands that will be added
+    """
+    return [band for band in METRIC_BANDS if band in metrics]
+
+
+def calculate_metrics(image: ee.Image, metrics: Collection[str]) -> ee.Image:
+    """
+    Calculate the requested metrics from Sentinel-2 imagery in a single pass.
+
+    Produces the same EVI, LAI and MSI bands as `calculate_evi`, `calculate_lai`
+    and `calculate_msi`, but scales each reflectance band once and adds all
+    metric bands together, so a collection needs only one `map()` pass.
+
+    Args:
+        image: Sentinel-2 image
+        metrics: Names of the metrics to calculate (EVI, LAI, MSI)
+
+    Returns:
+        Image with the requested metric bands added
+    """
+    nir = image.select("B8").divide(10000)
+    metric_bands = []
+
+    # LAI is derived from EVI, so compute EVI whenever either is requested
+    if "EVI" in metrics or "LAI" in metrics:
+        red = image.select("B4").divide(10000)
+        blue = image.select("B2").divide(10000)
+        evi = (
+            nir.subtract(red)
+            .multiply(2.5)
+            .divide(nir.add(red.multiply(6)).subtract(blue.multiply(7.5)).add(1))
+            .rename("EVI")
+        )
+        if "EVI" in metrics:
+            metric_bands.append(evi)
+        if "LAI" in metrics:
+            metric_bands.append(evi.multiply(3.618).subtract(0.118).rename("LAI"))
+
+    if "MSI" in metrics:
+        swir = image.select("B11").divide(10000)
+        metric_bands.append(swir.divide(nir).rename("MSI"))
+
+    if not metric_bands:
+        return image
+
+    return image.addBands(ee.Image.cat(metric_bands))
@@ -11,12 +11,10 @@ def calculate_msi(image: ee.Image) -> ee.Image:
     Returns:
         Image with MSI band added
     """
-    msi = image.expression(
-        "SWIR / NIR",
-        {
-            "SWIR": image.select("B11").divide(10000),  # SWIR (1.6µm)
-            "NIR": image.select("B8").divide(10000),  # NIR
-        },
-    ).rename("MSI")
+    swir = image.select("B11").divide(10000)  # SWIR (1.6µm)
+    nir = image.select("B8").divide(10000)  # NIR
+
+    # SWIR / NIR
+    msi = swir.divide(nir).rename("MSI")
 
     return image.addBands(msi)
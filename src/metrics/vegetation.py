@@ -13,14 +13,17 @@ def calculate_evi(image: ee.Image) -> ee.Image:
     Returns:
         Image with EVI band added
     """
-    evi = image.expression(
-        "2.5 * ((NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1))",
-        {
-            "NIR": image.select("B8").divide(10000),
-            "RED": image.select("B4").divide(10000),
-            "BLUE": image.select("B2").divide(10000),
-        },
-    ).rename("EVI")
+    nir = image.select("B8").divide(10000)
+    red = image.select("B4").divide(10000)
+    blue = image.select("B2").divide(10000)
+
+    # 2.5 * ((NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1))
+    evi = (
+        nir.subtract(red)
+        .multiply(2.5)
+        .divide(nir.add(red.multiply(6)).subtract(blue.multiply(7.5)).add(1))
+        .rename("EVI")
+    )
 
     return image.addBands(evi)
 
@@ -37,9 +40,7 @@ def calculate_lai(image: ee.Image) -> ee.Image:
     Returns:
         Image with LAI band added
     """
-    lai = image.expression(
-        "(3.618 * EVI - 0.118)",
-        {"EVI": image.select("EVI")},
-    ).rename("LAI")
+    # 3.618 * EVI - 0.118
+    lai = image.select("EVI").multiply(3.618).subtract(0.118).rename("LAI")
 
     return image.addBands(lai)
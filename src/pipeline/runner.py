@@ -1,19 +1,97 @@
 import json
 import logging
+import os
+import time
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cache, cached_property
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Any
 
 import ee
 import httpx
+import rasterio  # type: ignore
+from rasterio.shutil import copy as copy_raster  # type: ignore
 from tqdm import tqdm
 
+from config.areas import get_area, get_area_bounds_coords
 from src.extractors.sentinel import get_sentinel_data
-from src.metrics.moisture import calculate_msi
-from src.metrics.vegetation import calculate_evi, calculate_lai
+from src.metrics.combined import (
+    calculate_metrics,
+    get_metric_band_names,
+    get_required_bands,
+)
 from src.processors.preprocessing import add_date
 from src.statistics.distribution import VegetationIndexAnalyzer
 
+# orjson is an optional, faster JSON encoder
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["Pipeline"]
+
+# Earth Engine endpoint for workloads with many concurrent requests
+EE_HIGH_VOLUME_URL = "https://earthengine-highvolume.googleapis.com"
+
+# Read downloads in large chunks to keep per-chunk Python overhead negligible
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def _dump_json(data: Any) -> bytes:
+    """
+    Serialize data as indented JSON.
+
+    Args:
+        data: JSON-serializable data
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+@cache
+def _get_http_client() -> httpx.Client:
+    """
+    Get the HTTP client shared by all downloads.
+
+    Reusing one client keeps connections to the Earth Engine download host
+    alive across metrics. HTTP/2 is used when the optional ``h2`` package is
+    installed, so concurrent downloads can share a single connection.
+
+    Returns:
+        Shared httpx client
+    """
+    return httpx.Client(
+        http2=find_spec("h2") is not None,
+        timeout=300,
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+    )
+
+
+@cache
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool shared by latency-bound Earth Engine requests.
+
+    The pool is created on first use and reused across pipeline runs, so
+    starting and polling export tasks does not spawn new threads each time.
+    Its size can be set with the RS_MAX_WORKERS environment variable.
+
+    Returns:
+        Shared thread pool executor
+    """
+    return ThreadPoolExecutor(
+        max_workers=int(os.environ.get("RS_MAX_WORKERS", "16")),
+        thread_name_prefix="ee-io",
+    )
+
 
 class Pipeline:
     def __init__(self, config: dict[str, Any]):
@@ -26,6 +104,40 @@ class Pipeline:
         self.config = config
         self.logger = logging.getLogger("geospatial_pipeline")
         self.results: dict[str, Any] = {}
+        self.area_name: str = config.get("area", "finland")
+
+        # YAML dates stay plain strings so naming files needs no EE round-trip;
+        # callers may still pass an ee.Date
+        self.start_date: Any = config.get(
+            "start_date",
+        ) or datetime.now().strftime("%Y-%m-01")
+
+    # Earth Engine objects can only be built after ee.Initialize() has run in
+    # run(), so they are resolved on first use and then reused.
+    @cached_property
+    def _date_range(self) -> tuple[Any, Any]:
+        """Start and end dates of the extraction period."""
+        start_date = self.start_date
+        end_date = self.config.get("end_date") or ee.Date(start_date).advance(
+            1,
+            "month",
+        )
+        return start_date, end_date
+
+    @cached_property
+    def _area(self) -> ee.Geometry:
+        """Geometry of the configured area of interest."""
+        return get_area(self.area_name)
+
+    @cached_property
+    def _region(self) -> list:
+        """Bounds coordinates of the configured area, fetched once per run."""
+        return self._get_export_region(self.area_name)
+
+    @cached_property
+    def _metric_bands(self) -> list[str]:
+        """Metric bands added by _calculate_metrics, known from the config."""
+        return get_metric_band_names(self.config.get("metrics", ["EVI", "LAI"]))
 
     def run(self) -> dict[str, Any]:
         """
@@ -35,7 +147,10 @@ class Pipeline:
             Dictionary with processing results
         """
         try:
-            ee.Initialize()
+            if self.config.get("high_volume", True):
+                ee.Initialize(url=EE_HIGH_VOLUME_URL)
+            else:
+                ee.Initialize()
             self.logger.info("Starting pipeline run")
 
             # Extract data
@@ -48,7 +163,7 @@ class Pipeline:
 
             # Save results
             self.logger.info("Saving results")
-            saved_files = self._save_results(processed_data)
+            saved_files = self._save_results(processed_data, self._metric_bands)
 
             # Generate statistics if enabled
             if self.config.get("statistics", {}).get("enabled", False):
@@ -68,17 +183,16 @@ class Pipeline:
         Returns:
             Image collection from Sentinel data
         """
-        start_date = self.config.get("start_date") or ee.Date(
-            datetime.now().strftime("%Y-%m-01"),
+        start_date, end_date = self._date_range
+        cloud_config = self.config.get("cloud_masking", {})
+
+        return get_sentinel_data(
+            start_date,
+            end_date,
+            self._area,
+            max_cloud_percentage=cloud_config.get("threshold", 30),
+            cloud_masking=cloud_config.get("enabled", True),
         )
-        end_date = self.config.get("end_date") or start_date.advance(1, "month")
-        area_name = self.config.get("area", "finland")
-
-        from config.areas import get_area
-
-        area = get_area(area_name)
-
-        return get_sentinel_data(start_date, end_date, area)
 
     def _calculate_metrics(self, data: ee.ImageCollection) -> ee.Image:
         """
@@ -91,35 +205,68 @@ class Pipeline:
             Composite image with calculated metrics
         """
         metrics = self.config.get("metrics", ["EVI", "LAI"])
+        processing_config = self.config.get("processing", {})
+        target_crs = processing_config.get("target_crs")
+        target_scale = processing_config.get("target_scale", 10)
 
-        # Apply EVI calculation to all images
-        if "EVI" in metrics:
-            data = data.map(calculate_evi)
-
-        # Apply LAI calculation if needed
-        if "LAI" in metrics and "EVI" in metrics:
-            data = data.map(calculate_lai)
+        def process_image(image: ee.Image) -> ee.Image:
+            # Pin all inputs to one pixel grid so later steps never resample
+            if target_crs:
+                image = image.reproject(crs=target_crs, scale=target_scale)
+            return add_date(calculate_metrics(image, metrics))
 
-        # Apply MSI calculation if needed
-        if "MSI" in metrics:
-            data = data.map(calculate_msi)
-
-        # Add date bands
-        data = data.map(add_date)
+        # Drop bands no metric reads, then calculate all metrics and add
+        # date bands in a single pass
+        data = data.select(get_required_bands(metrics)).map(process_image)
 
         # Create composite
-        composite = data.median()
+        composite = self._create_composite(data)
 
         # Store in results
         self.results["composite"] = composite
         return composite
 
-    def _save_results(self, processed_data: ee.Image) -> dict[str, Path]:
+    def _create_composite(self, data: ee.ImageCollection) -> ee.Image:
+        """
+        Reduce the collection to a single image with the configured method.
+
+        A mean or mosaic streams through the collection, whereas a median
+        sorts every pixel's time series, so they are cheaper on long stacks.
+
+        Args:
+            data: Collection of images with calculated metrics
+
+        Returns:
+            Composite image
+
+        Raises:
+            ValueError: If the configured composite method is not supported
+        """
+        method = self.config.get("processing", {}).get("composite_method", "median")
+
+        if method == "median":
+            return data.median()
+        if method == "mean":
+            return data.mean()
+        if method == "mosaic":
+            return data.mosaic()
+
+        raise ValueError(
+            f"Unsupported composite method '{method}'. Options: median, mean, mosaic",
+        )
+
+    def _save_results(
+        self,
+        processed_data: ee.Image,
+        band_names: Collection[str] | None = None,
+    ) -> dict[str, Path]:
         """
         Save results to specified output locations as GeoTIFF files.
 
         Args:
             processed_data: Processed image with calculated metrics
+            band_names: Bands known to be in the processed image; fetched from
+                Earth Engine when not given
 
         Returns:
             Dictionary mapping metric names to saved file paths
@@ -132,6 +279,9 @@ class Pipeline:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
+        # Resolve any remaining server-side values in a single round-trip
+        band_names = self._prefetch_server_values(processed_data, band_names)
+
         # Prepare base file information
         file_info = self._prepare_file_info()
 
@@ -139,37 +289,349 @@ class Pipeline:
         metrics = self.config.get("metrics", ["EVI", "LAI", "MSI"])
 
         # Get area geometry for export
-        region = self._get_export_region(file_info["area_name"])
+        region = self._region
 
         # Download and save each metric
         saved_files: dict[str, Path] = {}
-        saved_file_names: list[str] = []
 
-        # Get band names once to avoid repeated calls
-        band_names_info = processed_data.bandNames().getInfo()
+        # Get band names once to avoid repeated server round-trips
+        if band_names is None:
+            band_names = set(processed_data.bandNames().getInfo() or [])
 
+        available_metrics = []
         for metric in metrics:
-            if band_names_info is not None and metric in band_names_info:
-                output_file = self._save_metric_geotiff(
-                    metric=metric,
-                    image=processed_data,
-                    output_path=output_path,
-                    file_info=file_info,
-                    region=region,
-                )
-                if output_file:
-                    saved_files[metric] = output_file
-                    saved_file_names.append(str(output_file.name))
+            if metric in band_names:
+                available_metrics.append(metric)
             else:
                 self.logger.warning(f"Metric {metric} not found in processed data")
 
+        if available_metrics:
+            processed_data = self._materialize_composite(
+                processed_data.select(available_metrics),
+                file_info,
+                region,
+            )
+
+            export_mode = self.config.get("export", {}).get("mode", "download")
+            if export_mode == "gcs":
+                output_files = self._export_metrics_to_gcs(
+                    available_metrics,
+                    processed_data,
+                    file_info,
+                    region,
+                )
+            elif self.config.get("output", {}).get("multiband", True):
+                output_files = self._save_multiband_geotiff(
+                    available_metrics,
+                    processed_data,
+                    output_path,
+                    file_info,
+                    region,
+                )
+            else:
+                output_files = self._download_metrics(
+                    available_metrics,
+                    processed_data,
+                    output_path,
+                    file_info,
+                    region,
+                )
+
+            # Collect in configured order so the metadata is deterministic
+            saved_files = {
+                metric: output_file
+                for metric in available_metrics
+                if (output_file := output_files[metric])
+            }
+
         # Save metadata
+        saved_file_names = [path.name for path in saved_files.values()]
         self._save_metadata(output_path, file_info, metrics, saved_file_names)
 
         self.logger.info(f"Results processing complete, files saved to {output_dir}")
 
         return saved_files
 
+    def _prefetch_server_values(
+        self,
+        processed_data: ee.Image,
+        band_names: Collection[str] | None,
+    ) -> Collection[str] | None:
+        """
+        Fetch the values _save_results still needs from the server at once.
+
+        The band names, area bounds and an ee.Date start date are independent,
+        so when more than one of them is unknown they are requested with a
+        single ee.List getInfo() and stored where the later lookups find them.
+
+        Args:
+            processed_data: Processed image with calculated metrics
+            band_names: Bands known to be in the processed image, if any
+
+        Returns:
+            Band names of the processed image, or band_names if they were
+            given or left to be fetched on their own
+        """
+        pending: dict[str, Any] = {}
+        if band_names is None:
+            pending["band_names"] = processed_data.bandNames()
+        if "_region" not in self.__dict__:
+            pending["bounds"] = self._area.bounds()
+        if isinstance(self.start_date, ee.Date):
+            pending["start_date"] = self.start_date.format("YYYY-MM-dd")
+
+        # A single value gains nothing from batching
+        if len(pending) < 2:
+            return band_names
+
+        values = dict(zip(pending, ee.List(list(pending.values())).getInfo() or []))
+
+        if "bounds" in values:
+            bounds = values["bounds"]
+            if bounds is None:
+                self.logger.warning(
+                    f"Could not get region bounds for {self.area_name}, "
+                    "using empty coordinates",
+                )
+            self._region = bounds["coordinates"] if bounds else []
+        if "start_date" in values:
+            self.start_date = values["start_date"]
+        if "band_names" in values:
+            return set(values["band_names"] or [])
+
+        return band_names
+
+    def _download_metrics(
+        self,
+        metrics: list[str],
+        image: ee.Image,
+        output_path: Path,
+        file_info: dict[str, str],
+        region: list,
+    ) -> dict[str, Path | None]:
+        """
+        Download several metrics concurrently as local GeoTIFF files.
+
+        Args:
+            metrics: Names of the metrics to download
+            image: Earth Engine image containing the metrics
+            output_path: Directory to save the files
+            file_info: Dictionary with file naming information
+            region: Coordinates defining the export region
+
+        Returns:
+            Dictionary mapping metric names to saved file paths, or None for
+            metrics that failed to download
+        """
+        # Downloads are network-bound, so fetch the metrics concurrently
+        max_workers = min(
+            len(metrics),
+            self.config.get("output", {}).get("max_workers", 4),
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                metric: executor.submit(
+                    self._save_metric_geotiff,
+                    metric=metric,
+                    image=image,
+                    output_path=output_path,
+                    file_info=file_info,
+                    region=region,
+                )
+                for metric in metrics
+            }
+
+        return {metric: future.result() for metric, future in futures.items()}
+
+    def _export_projection(self) -> dict[str, Any]:
+        """
+        Get the projection arguments for Earth Engine batch exports.
+
+        Returns:
+            Dictionary with the crs and either a crsTransform or a scale
+        """
+        export_config = self.config.get("export", {})
+        projection: dict[str, Any] = {"crs": export_config.get("crs", "EPSG:4326")}
+
+        # A fixed pixel grid replaces the scale and avoids resampling; without
+        # one, Earth Engine derives the grid from the scale
+        if crs_transform := export_config.get("crs_transform"):
+            projection["crsTransform"] = crs_transform
+        else:
+            projection["scale"] = export_config.get("scale", 100)
+
+        return projection
+
+    def _materialize_composite(
+        self,
+        image: ee.Image,
+        file_info: dict[str, str],
+        region: list,
+    ) -> ee.Image:
+        """
+        Store the composite as an Earth Engine asset when one is configured.
+
+        Every export or download of the computed composite re-runs the whole
+        collection reduction. Exporting it to an asset once lets the per-metric
+        outputs read stored pixels instead.
+
+        Args:
+            image: Composite image with the metrics to save
+            file_info: Dictionary with file naming information
+            region: Coordinates defining the export region
+
+        Returns:
+            The stored asset image, or the given image when no asset root is
+            configured or the asset export failed
+        """
+        export_config = self.config.get("export", {})
+        asset_root = export_config.get("asset_root")
+        if not asset_root:
+            return image
+
+        asset_id = f"{asset_root.rstrip('/')}/{file_info['filename_base']}"
+        task = ee.batch.Export.image.toAsset(
+            image=image,
+            description=f"{file_info['filename_base']}_composite",
+            assetId=asset_id,
+            region=region,
+            **self._export_projection(),
+            maxPixels=export_config.get("max_pixels", 1e13),
+            overwrite=True,
+        )
+        task.start()
+        self.logger.info(f"Started export of the composite to {asset_id}")
+
+        stored = self._wait_for_export_tasks(
+            {"composite": (task, asset_id)},
+            export_config.get("poll_interval", 10),
+        )
+        if stored["composite"] is None:
+            self.logger.warning("Saving metrics from the computed composite instead")
+            return image
+
+        return ee.Image(asset_id)
+
+    def _export_metrics_to_gcs(
+        self,
+        metrics: list[str],
+        image: ee.Image,
+        file_info: dict[str, str],
+        region: list,
+    ) -> dict[str, Path | None]:
+        """
+        Export metrics to Google Cloud Storage with Earth Engine batch tasks.
+
+        Unlike direct downloads, batch exports are tiled and rendered
+        server-side, so they are not limited by the download size cap. All
+        tasks are started up front and then polled together. Each metric
+        gets its own task, since the exported files are read in place through
+        /vsigs/ as single-band rasters and a multi-band export could only be
+        split after downloading it.
+
+        Args:
+            metrics: Names of the metrics to export
+            image: Earth Engine image containing the metrics
+            file_info: Dictionary with file naming information
+            region: Coordinates defining the export region
+
+        Returns:
+            Dictionary mapping metric names to GDAL ``/vsigs/`` paths of the
+            exported files, or None for metrics whose export failed
+
+        Raises:
+            ValueError: If no export bucket is configured
+        """
+        export_config = self.config.get("export", {})
+        bucket = export_config.get("bucket")
+        if not bucket:
+            raise ValueError("export.bucket must be set when export.mode is 'gcs'")
+
+        # Building task objects is local; only starting them hits the server
+        tasks = {}
+        for metric in metrics:
+            file_prefix = f"{file_info['filename_base']}_{metric}"
+            task = ee.batch.Export.image.toCloudStorage(
+                image=image.select(metric),
+                description=file_prefix,
+                bucket=bucket,
+                fileNamePrefix=file_prefix,
+                region=region,
+                **self._export_projection(),
+                maxPixels=export_config.get("max_pixels", 1e13),
+                fileFormat="GeoTIFF",
+                formatOptions={"cloudOptimized": True},
+                # Regions larger than this are split into several files, which
+                # the single /vsigs/ path below does not account for
+                fileDimensions=export_config.get("file_dimensions", [32768, 32768]),
+            )
+            tasks[metric] = (task, Path(f"/vsigs/{bucket}/{file_prefix}.tif"))
+
+        # Each start() is a latency-bound request, so submit them concurrently
+        list(_get_executor().map(lambda entry: entry[0].start(), tasks.values()))
+
+        for metric, (_, output_file) in tasks.items():
+            self.logger.info(f"Started export of {metric} to {output_file}")
+        self.results["export_tasks"] = {
+            metric: task for metric, (task, _) in tasks.items()
+        }
+
+        return self._wait_for_export_tasks(
+            tasks,
+            export_config.get("poll_interval", 10),
+        )
+
+    def _wait_for_export_tasks[T](
+        self,
+        tasks: dict[str, tuple[Any, T]],
+        poll_interval: float,
+    ) -> dict[str, T | None]:
+        """
+        Poll Earth Engine export tasks until all of them have finished.
+
+        Args:
+            tasks: Dictionary mapping names to (task, output location) pairs
+            poll_interval: Seconds to wait between polling rounds
+
+        Returns:
+            Dictionary mapping names to output locations, or None for
+            tasks that failed or were cancelled
+        """
+        results: dict[str, T | None] = {}
+        pending = dict(tasks)
+
+        while pending:
+            # Fetch every pending task's status concurrently
+            statuses = _get_executor().map(
+                lambda entry: entry[0].status(),
+                pending.values(),
+            )
+
+            for (metric, (_, output_file)), status in zip(
+                list(pending.items()),
+                statuses,
+            ):
+                state = status.get("state")
+
+                if state == "COMPLETED":
+                    self.logger.info(f"Successfully exported {metric} to {output_file}")
+                    results[metric] = output_file
+                elif state in ("FAILED", "CANCELLED"):
+                    self.logger.error(
+                        f"Export of {metric} {state.lower()}: "
+                        f"{status.get('error_message', 'unknown error')}",
+                    )
+                    results[metric] = None
+                else:
+                    continue
+
+                del pending[metric]
+
+            if pending:
+                time.sleep(poll_interval)
+
+        return results
+
     def _prepare_file_info(self) -> dict[str, str]:
         """
         Prepare base file information for output files.
@@ -181,9 +643,10 @@ class Pipeline:
         output_prefix = output_config.get("prefix", "rs_metrics_")
 
         # Get area name and dates for naming
-        area_name = self.config.get("area", "finland")
-        start_date = self.config.get("start_date", datetime.now().strftime("%Y-%m-01"))
+        area_name = self.area_name
+        start_date = self.start_date
 
+        # Only dates passed in as ee.Date need formatting on the server
         if isinstance(start_date, ee.Date):
             start_date = start_date.format("YYYY-MM-dd").getInfo()
 
@@ -207,18 +670,111 @@ class Pipeline:
         Returns:
             List of coordinates defining the region bounds
         """
-        from config.areas import get_area
+        coordinates = get_area_bounds_coords(area_name)
 
-        area = get_area(area_name)
-        bounds_info = area.bounds().getInfo()
-
-        if bounds_info is None:
+        if coordinates is None:
             self.logger.warning(
                 f"Could not get region bounds for {area_name}, using empty coordinates",
             )
             return []
 
-        return bounds_info["coordinates"]
+        return coordinates
+
+    def _download_params(self, region: list) -> dict[str, Any]:
+        """
+        Get the Earth Engine parameters for a GeoTIFF download.
+
+        Args:
+            region: Coordinates defining the export region
+
+        Returns:
+            Dictionary of getDownloadURL parameters
+        """
+        export_config = self.config.get("export", {})
+        params = {
+            "region": region,
+            "format": "GEO_TIFF",
+            "crs": export_config.get("crs", "EPSG:4326"),
+        }
+
+        # Earth Engine rescales the region to fit the dimensions, which would
+        # resample away a configured native pixel grid
+        if crs_transform := export_config.get("crs_transform"):
+            params["crs_transform"] = crs_transform
+        else:
+            params["dimensions"] = 1024  # Limit size for reasonable download
+
+        return params
+
+    def _save_multiband_geotiff(
+        self,
+        metrics: list[str],
+        image: ee.Image,
+        output_path: Path,
+        file_info: dict[str, str],
+        region: list,
+    ) -> dict[str, Path | None]:
+        """
+        Download several metrics as one multi-band GeoTIFF and split it.
+
+        A single download renders the composite once on the server instead of
+        once per metric. The bands are then written to the usual per-metric
+        files so downstream steps are unaffected.
+
+        Args:
+            metrics: Names of the metrics to save
+            image: Earth Engine image containing the metrics
+            output_path: Directory to save the files
+            file_info: Dictionary with file naming information
+            region: Coordinates defining the export region
+
+        Returns:
+            Dictionary mapping metric names to saved file paths, or None for
+            metrics that were not saved because the download or their band
+            failed
+        """
+        filename_base = file_info["filename_base"]
+        cloud_optimized = self.config.get("output", {}).get("cloud_optimized", False)
+        combined_file = output_path / f"{filename_base}_all.tif"
+        self.logger.info(f"Saving {', '.join(metrics)} to: {combined_file}")
+
+        output_files: dict[str, Path | None] = dict.fromkeys(metrics)
+        try:
+            url = image.select(metrics).getDownloadURL(self._download_params(region))
+            self._download_file_with_progress(url, combined_file, "Downloading metrics")
+
+            with rasterio.open(combined_file) as src:
+                profile = src.profile.copy()
+                profile.update(count=1)
+
+                # Each band is saved on its own, so one failed band does not
+                # lose the others
+                for band_index, metric in enumerate(metrics, start=1):
+                    output_file = output_path / f"{filename_base}_{metric}.tif"
+                    try:
+                        with rasterio.open(output_file, "w", **profile) as dst:
+                            dst.write(src.read(band_index), 1)
+                            dst.set_band_description(1, metric)
+
+                        if cloud_optimized:
+                            self._convert_to_cog(output_file)
+
+                    except Exception as e:
+                        self.logger.error(f"Failed to save {metric}: {str(e)}")
+                        # The file may be incomplete
+                        output_file.unlink(missing_ok=True)
+                        continue
+
+                    self.logger.info(f"Successfully saved {metric} to {output_file}")
+                    output_files[metric] = output_file
+
+        except Exception as e:
+            self.logger.error(f"Failed to save {combined_file}: {str(e)}")
+
+        finally:
+            combined_file.unlink(missing_ok=True)
+
+        return output_files
 
     def _save_metric_geotiff(
         self,
@@ -245,20 +801,18 @@ class Pipeline:
         self.logger.info(f"Saving {metric} to: {output_file}")
 
         try:
-            # Set up parameters for the GeoTIFF export
-            params = {
-                "region": region,
-                "dimensions": 1024,  # Limit size for reasonable download
-                "format": "GEO_TIFF",
-                "crs": "EPSG:4326",  # WGS84
-            }
-
             # Get download URL for this band
-            url = image.select(metric).getDownloadURL(params)
+            url = image.select(metric).getDownloadURL(
+                self._download_params(region),
+            )
 
             # Download the GeoTIFF with progress indication
             self._download_file_with_progress(url, output_file, f"Downloading {metric}")
 
+            # getDownloadURL cannot produce COGs, so rewrite the file locally
+            if self.config.get("output", {}).get("cloud_optimized", False):
+                self._convert_to_cog(output_file)
+
             self.logger.info(f"Successfully saved {metric} to {output_file}")
             return output_file
 
@@ -280,7 +834,7 @@ class Pipeline:
             output_file: Path where the file should be saved
             desc: Description for the progress bar
         """
-        with httpx.stream("GET", url, timeout=300) as response:
+        with _get_http_client().stream("GET", url) as response:
             response.raise_for_status()
 
             # Get total size if available
@@ -295,11 +849,36 @@ class Pipeline:
                 leave=True,
             ) as progress_bar:
                 with open(output_file, "wb") as f:
-                    for chunk in response.iter_bytes(chunk_size=8192):
+                    for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
                         if chunk:
                             f.write(chunk)
                             progress_bar.update(len(chunk))
 
+    @staticmethod
+    def _convert_to_cog(geotiff_file: Path) -> None:
+        """
+        Rewrite a GeoTIFF in place as a Cloud-Optimized GeoTIFF.
+
+        The COG layout (512x512 tiles, overviews, DEFLATE with a predictor)
+        lets downstream readers fetch only the blocks they need.
+
+        Args:
+            geotiff_file: Path of the GeoTIFF file to convert
+        """
+        cog_file = geotiff_file.with_suffix(".cog.tif")
+        try:
+            copy_raster(
+                geotiff_file,
+                cog_file,
+                driver="COG",
+                blocksize=512,
+                compress="DEFLATE",
+                predictor="YES",
+            )
+            os.replace(cog_file, geotiff_file)
+        finally:
+            cog_file.unlink(missing_ok=True)
+
     def _save_metadata(
         self,
         output_path: Path,
@@ -329,9 +908,13 @@ class Pipeline:
 
         self.results["metadata"] = metadata
 
+        # Write to a temporary file and rename it so readers never see a
+        # partially written metadata file
+        tmp_file = metadata_file.with_suffix(".json.tmp")
         try:
-            with open(metadata_file, "w") as f:
-                json.dump(metadata, f, indent=2)
+            with open(tmp_file, "wb") as f:
+                f.write(_dump_json(metadata))
+            os.replace(tmp_file, metadata_file)
             self.logger.info(f"Saved processing metadata to {metadata_file}")
         except Exception as e:
             self.logger.error(f"Failed to save metadata: {str(e)}")
@@ -362,7 +945,12 @@ class Pipeline:
         self.logger.info(
             f"Initializing statistical analysis, outputs will be saved to {stats_output_dir}",
         )
-        analyzer = VegetationIndexAnalyzer(stats_output_dir)
+        analyzer = VegetationIndexAnalyzer(
+            stats_output_dir,
+            plot_dpi=stats_config.get("plot_dpi"),
+            use_cache=stats_config.get("cache", False),
+            stream_pixels=stats_config.get("stream_pixels"),
+        )
 
         # Analyze individual indices
         individual_stats = {}
@@ -11,7 +11,34 @@ def add_date(image: ee.Image) -> ee.Image:
     Returns:
         Image with additional date band
     """
-    img_date = ee.Date(image.date())
-    img_date = ee.Number.parse(img_date.format("YYYYMMdd"))
+    img_date = image.date()
 
-    return image.addBands(ee.Image(img_date).rename("date").toInt())
+    # Encode as YYYYMMDD with arithmetic rather than formatting and parsing a string
+    ymd = (
+        img_date.get("year")
+        .multiply(10000)
+        .add(img_date.get("month").multiply(100))
+        .add(img_date.get("day"))
+    )
+
+    return image.addBands(ee.Image.constant(ymd).rename("date").toInt())
+
+
+def mask_clouds(image: ee.Image) -> ee.Image:
+    """
+    Mask cloudy pixels using the Sentinel-2 QA60 quality band.
+
+    Args:
+        image: Sentinel-2 image with a QA60 band
+
+    Returns:
+        Image with opaque cloud and cirrus pixels masked out
+    """
+    qa = image.select("QA60")
+
+    # Bits 10 and 11 flag opaque clouds and cirrus, respectively
+    cloud_bit_mask = 1 << 10
+    cirrus_bit_mask = 1 << 11
+    mask = qa.bitwiseAnd(cloud_bit_mask).eq(0).And(qa.bitwiseAnd(cirrus_bit_mask).eq(0))
+
+    return image.updateMask(mask)
@@ -1,44 +1,264 @@
+import csv
+import json
+import math
+import multiprocessing
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import rasterio  # type: ignore
-import seaborn as sns
-from scipy import stats  # type: ignore
+from scipy import signal, special, stats  # type: ignore
+
+
+def _moments(data: np.ndarray) -> tuple[float, float, float, float, float, float]:
+    """
+    Calculate the mean, central moments and range of an array with NumPy.
+
+    Args:
+        data: Array of valid data values
+
+    Returns:
+        Tuple of the mean, second to fourth central moments, minimum and
+        maximum
+    """
+    mean = float(data.mean())
+    deviations = data - mean
+    squared = deviations * deviations
+
+    return (
+        mean,
+        float(squared.mean()),
+        float((squared * deviations).mean()),
+        float((squared * squared).mean()),
+        float(data.min()),
+        float(data.max()),
+    )
+
+
+def _combine_moments(
+    a: tuple[int, float, float, float, float],
+    b: tuple[int, float, float, float, float],
+) -> tuple[int, float, float, float, float]:
+    """
+    Combine the central moments of two disjoint sets of values.
+
+    Args:
+        a: Count, mean and second to fourth central moment sums of one set
+        b: The same quantities for the other set
+
+    Returns:
+        Count, mean and central moment sums of the union of both sets
+    """
+    n_a, mean_a, m2_a, m3_a, m4_a = a
+    n_b, mean_b, m2_b, m3_b, m4_b = b
+    n = n_a + n_b
+    delta = mean_b - mean_a
+
+    m2 = m2_a + m2_b + delta**2 * n_a * n_b / n
+    m3 = (
+        m3_a
+        + m3_b
+        + delta**3 * n_a * n_b * (n_a - n_b) / n**2
+        + 3 * delta * (n_a * m2_b - n_b * m2_a) / n
+    )
+    m4 = (
+        m4_a
+        + m4_b
+        + delta**4 * n_a * n_b * (n_a**2 - n_a * n_b + n_b**2) / n**3
+        + 6 * delta**2 * (n_a**2 * m2_b + n_b**2 * m2_a) / n**2
+        + 4 * delta * (n_a * m3_b - n_b * m3_a) / n
+    )
+
+    return n, mean_a + delta * n_b / n, m2, m3, m4
 
 
 class StatisticsCalculator:
     """Calculate basic statistics from geospatial raster data."""
 
+    # Keys of calculate_basic_stats, in order
+    STAT_NAMES = (
+        "count",
+        "mean",
+        "median",
+        "std",
+        "var",
+        "min",
+        "max",
+        "range",
+        "percentile_25",
+        "percentile_75",
+        "iqr",
+        "skewness",
+        "kurtosis",
+    )
+
+    # Rasters with more pixels than this are summarized block by block by
+    # default, so their band is never held in memory as a whole
+    STREAM_PIXEL_THRESHOLD = 50_000_000
+
     @staticmethod
     def load_raster_data(
         geotiff_path: str,
+        out: np.ndarray | None = None,
     ) -> tuple[np.ndarray, float | None, dict[str, Any]]:
         """
         Load data from a GeoTIFF file.
 
         Args:
             geotiff_path: Path to the GeoTIFF file
+            out: Optional preallocated array of the band's shape and dtype to
+                read into, so rasters of the same shape can share one buffer.
+                The returned data may be a view of it, so use the data before
+                reading the next raster into the same buffer.
 
         Returns:
             Tuple containing the valid data array, nodata value, and metadata
         """
         with rasterio.open(geotiff_path) as src:
-            data = src.read(1)
+            # The masked read flags nodata pixels, including NaN nodata, so the
+            # band does not have to be compared against the nodata value
+            data = src.read(1, out=out, masked=True)
             nodata = src.nodata
             meta = src.meta
 
-            # Filter out nodata values
-            if nodata is not None:
-                valid_data = data[data != nodata]
-            else:
-                valid_data = data.flatten()
+        # Filter out nodata values; ravel() is a view, so rasters without
+        # nodata pixels are returned without copying
+        mask = np.ma.getmaskarray(data)
+        if mask.any():
+            valid_data = data.data[~mask]
+        else:
+            valid_data = data.data.ravel()
 
         return valid_data, nodata, meta
 
+    @staticmethod
+    def pixel_count(geotiff_path: str) -> int:
+        """
+        Get the number of pixels in a GeoTIFF band without reading it.
+
+        Args:
+            geotiff_path: Path to the GeoTIFF file
+
+        Returns:
+            Width times height of the raster
+        """
+        with rasterio.open(geotiff_path) as src:
+            return src.width * src.height
+
+    @staticmethod
+    def stream_stats(
+        geotiff_path: str,
+        bins: int = 4096,
+        sample_size: int = 0,
+    ) -> tuple[dict[str, float], np.ndarray]:
+        """
+        Calculate basic statistics by reading a GeoTIFF block by block.
+
+        Peak memory is bounded by the raster's block size and the sample
+        instead of the whole band. The moments are merged exactly across
+        blocks, while the median and quartiles come from a histogram filled in
+        a second pass, so they are accurate to within (max - min) / bins.
+
+        Args:
+            geotiff_path: Path to the GeoTIFF file
+            bins: Number of histogram bins used to estimate the percentiles
+            sample_size: Expected number of pixels in the returned random
+                sample if every pixel is valid; nodata pixels lower it
+                proportionally
+
+        Returns:
+            Tuple of a dictionary with the same statistics as
+            calculate_basic_stats and a random sample of the valid data
+
+        Raises:
+            ValueError: If the raster contains no valid data
+        """
+        moments = (0, 0.0, 0.0, 0.0, 0.0)
+        data_min, data_max = np.inf, -np.inf
+        rng = np.random.default_rng()
+        samples = []
+
+        with rasterio.open(geotiff_path) as src:
+            windows = [window for _, window in src.block_windows(1)]
+            # Keeping each pixel with the same probability samples uniformly
+            # without knowing the number of valid pixels up front
+            sample_rate = min(1.0, sample_size / (src.width * src.height))
+
+            def read_valid(window: Any) -> np.ndarray:
+                block = src.read(1, window=window, masked=True)
+                return block.compressed().astype(np.float64)
+
+            # First pass: count, moments and range
+            for window in windows:
+                block = read_valid(window)
+                if block.size == 0:
+                    continue
+
+                if sample_rate:
+                    samples.append(block[rng.random(block.size) < sample_rate])
+
+                block_mean = float(block.mean())
+                deviations = block - block_mean
+                squared = deviations * deviations
+                moments = _combine_moments(
+                    moments,
+                    (
+                        block.size,
+                        block_mean,
+                        float(squared.sum()),
+                        float((squared * deviations).sum()),
+                        float((squared * squared).sum()),
+                    ),
+                )
+                data_min = min(data_min, float(block.min()))
+                data_max = max(data_max, float(block.max()))
+
+            count, mean, m2, m3, m4 = moments
+            if count == 0:
+                raise ValueError(f"{geotiff_path} contains no valid data")
+
+            # Second pass: histogram over the now known range for percentiles
+            if data_max > data_min:
+                edges = np.linspace(data_min, data_max, bins + 1)
+                histogram = np.zeros(bins, dtype=np.int64)
+                for window in windows:
+                    histogram += np.histogram(read_valid(window), bins=edges)[0]
+
+                cumulative = np.concatenate(([0], np.cumsum(histogram)))
+                percentile_25, median, percentile_75 = np.interp(
+                    np.array([0.25, 0.5, 0.75]) * count,
+                    cumulative,
+                    edges,
+                )
+            else:
+                percentile_25 = median = percentile_75 = data_min
+
+        var = m2 / count
+        stats_dict = {
+            "count": count,
+            "mean": mean,
+            "median": float(median),
+            "std": float(np.sqrt(var)),
+            "var": var,
+            "min": data_min,
+            "max": data_max,
+            "range": data_max - data_min,
+            "percentile_25": float(percentile_25),
+            "percentile_75": float(percentile_75),
+            "iqr": float(percentile_75 - percentile_25),
+            "skewness": float(np.sqrt(count) * m3 / m2**1.5) if m2 else float("nan"),
+            "kurtosis": float(count * m4 / m2**2 - 3) if m2 else float("nan"),
+        }
+        sample = np.concatenate(samples) if samples else np.empty(0)
+
+        return stats_dict, sample
+
     @staticmethod
     def calculate_basic_stats(data: np.ndarray) -> dict[str, float]:
         """
@@ -50,28 +270,45 @@ class StatisticsCalculator:
         Returns:
             dictionary containing basic statistics
         """
+        # Compute each reduction once; the quartiles and median share a single
+        # partition of the data, and the moments one array of deviations
+        percentile_25, median, percentile_75 = np.percentile(data, [25, 50, 75])
+        mean, var, m3, m4, data_min, data_max = _moments(np.ravel(data))
+
         return {
             "count": len(data),
-            "mean": float(np.mean(data)),
-            "median": float(np.median(data)),
-            "std": float(np.std(data)),
-            "var": float(np.var(data)),
-            "min": float(np.min(data)),
-            "max": float(np.max(data)),
-            "range": float(np.max(data) - np.min(data)),
-            "percentile_25": float(np.percentile(data, 25)),
-            "percentile_75": float(np.percentile(data, 75)),
-            "iqr": float(np.percentile(data, 75) - np.percentile(data, 25)),
-            "skewness": float(stats.skew(data)),
-            "kurtosis": float(stats.kurtosis(data)),
+            "mean": float(mean),
+            "median": float(median),
+            "std": float(np.sqrt(var)),
+            "var": float(var),
+            "min": float(data_min),
+            "max": float(data_max),
+            "range": float(data_max - data_min),
+            "percentile_25": float(percentile_25),
+            "percentile_75": float(percentile_75),
+            "iqr": float(percentile_75 - percentile_25),
+            # Biased estimators, matching scipy.stats.skew and kurtosis defaults
+            "skewness": float(m3 / var**1.5) if var else float("nan"),
+            "kurtosis": float(m4 / var**2 - 3) if var else float("nan"),
         }
 
 
 class NormalityTester:
     """Perform normality tests on geospatial data."""
 
+    # Shapiro-Wilk scales quadratically and rejects almost any real raster at
+    # large sample sizes, so it runs on a smaller subsample
+    SHAPIRO_MAX_SAMPLE = 500
+
+    # Anderson-Darling critical value at 5% significance for a normal
+    # distribution with estimated mean and variance
+    ANDERSON_CRITICAL_VALUE = 0.752
+
+    # Sample size of the other normality tests
+    MAX_SAMPLE = 5000
+
     @staticmethod
-    def sample_data(data: np.ndarray, max_sample: int = 5000) -> np.ndarray:
+    def sample_data(data: np.ndarray, max_sample: int = MAX_SAMPLE) -> np.ndarray:
         """
         Sample data for normality tests to improve computational efficiency.
 
@@ -82,8 +319,14 @@ class NormalityTester:
         Returns:
             Sampled data array
         """
-        sample_size = min(max_sample, len(data))
-        return np.random.choice(data, size=sample_size, replace=False)
+        if len(data) <= max_sample:
+            return data
+
+        # Drawing indices with the Generator API avoids permuting the whole
+        # array, so the cost scales with the sample size rather than the raster
+        rng = np.random.default_rng()
+        indices = rng.choice(len(data), size=max_sample, replace=False, shuffle=False)
+        return data[indices]
 
     @staticmethod
     def shapiro_test(data: np.ndarray) -> dict[str, float]:
@@ -119,23 +362,43 @@ class NormalityTester:
             "dagostino_p_value": float(result.pvalue),
         }
 
-    @staticmethod
-    def anderson_test(data: np.ndarray) -> dict[str, float]:
+    @classmethod
+    def anderson_test(
+        cls,
+        data: np.ndarray,
+        assume_sorted: bool = False,
+    ) -> dict[str, float]:
         """
         Perform Anderson-Darling normality test.
 
+        The statistic is computed as by scipy.stats.anderson, but directly on
+        the normal log-CDF so that an already sorted sample is not sorted again.
+
         Args:
             data: Data array
+            assume_sorted: Whether the data is already in ascending order
 
         Returns:
             Dictionary with test statistic and critical value
         """
-        result = stats.anderson(data)
+        ordered = data if assume_sorted else np.sort(data)
+        n = len(ordered)
+        z = (ordered - ordered.mean()) / ordered.std(ddof=1)
+
+        # A^2 = -n - sum((2i - 1) / n * (ln F(z_i) + ln(1 - F(z_{n+1-i}))))
+        weights = np.arange(1, 2 * n, 2) / n
+        statistic = -n - np.sum(
+            weights * (special.log_ndtr(z) + special.log_ndtr(-z[::-1])),
+        )
+
+        # Critical value at 5% significance, adjusted for the sample size
+        critical_value = round(
+            cls.ANDERSON_CRITICAL_VALUE / (1 + 0.75 / n + 2.25 / n**2),
+            3,
+        )
         return {
-            "anderson_statistic": float(result.statistic),
-            "anderson_critical_value": float(
-                result.critical_values[2],
-            ),  # Critical values at 5% significance
+            "anderson_statistic": float(statistic),
+            "anderson_critical_value": float(critical_value),
         }
 
     @classmethod
@@ -149,14 +412,18 @@ class NormalityTester:
         Returns:
             Dictionary with all test results
         """
-        # Sample data for efficient testing
-        sample_data = cls.sample_data(data)
+        # Sample data for efficient testing; D'Agostino's test does not
+        # depend on the order, so the sorted sample serves both it and
+        # Anderson-Darling
+        sample_data = np.sort(cls.sample_data(data, cls.MAX_SAMPLE))
 
         # Run all tests
         results = {}
-        results.update(cls.shapiro_test(sample_data))
+        results.update(
+            cls.shapiro_test(cls.sample_data(sample_data, cls.SHAPIRO_MAX_SAMPLE)),
+        )
         results.update(cls.dagostino_test(sample_data))
-        results.update(cls.anderson_test(sample_data))
+        results.update(cls.anderson_test(sample_data, assume_sorted=True))
 
         return results
 
@@ -171,47 +438,229 @@ class NormalityTester:
         Returns:
             Tuple of (is_normal, reasons)
         """
-        is_normal = True
+        shapiro_p = stats_dict["shapiro_p_value"]
+        dagostino_p = stats_dict["dagostino_p_value"]
+        anderson_statistic = stats_dict["anderson_statistic"]
+        anderson_critical = stats_dict["anderson_critical_value"]
+        skewness = stats_dict.get("skewness", 0.0)
+
         reasons = []
 
         # Interpret Shapiro-Wilk test (p < 0.05 means not normal)
-        if stats_dict["shapiro_p_value"] < 0.05:
-            is_normal = False
-            reasons.append(
-                f"Shapiro-Wilk test p-value: {stats_dict['shapiro_p_value']:.6f} < 0.05",
-            )
+        if shapiro_p < 0.05:
+            reasons.append(f"Shapiro-Wilk test p-value: {shapiro_p:.6f} < 0.05")
 
         # Interpret D'Agostino's test
-        if stats_dict["dagostino_p_value"] < 0.05:
-            is_normal = False
-            reasons.append(
-                f"D'Agostino's test p-value: {stats_dict['dagostino_p_value']:.6f} < 0.05",
-            )
+        if dagostino_p < 0.05:
+            reasons.append(f"D'Agostino's test p-value: {dagostino_p:.6f} < 0.05")
 
         # Interpret Anderson-Darling test
-        if stats_dict["anderson_statistic"] > stats_dict["anderson_critical_value"]:
-            is_normal = False
+        if anderson_statistic > anderson_critical:
             reasons.append(
-                f"Anderson-Darling test: {stats_dict['anderson_statistic']:.4f} > "
-                f"{stats_dict['anderson_critical_value']:.4f} (critical value)",
+                f"Anderson-Darling test: {anderson_statistic:.4f} > "
+                f"{anderson_critical:.4f} (critical value)",
             )
 
         # Interpret skewness
-        if "skewness" in stats_dict and abs(stats_dict["skewness"]) > 0.5:
-            is_normal = False
-            skew_dir = "right" if stats_dict["skewness"] > 0 else "left"
+        if abs(skewness) > 0.5:
+            skew_dir = "right" if skewness > 0 else "left"
             reasons.append(
-                f"Skewness: {stats_dict['skewness']:.4f}, indicating {skew_dir}-skewed distribution",
+                f"Skewness: {skewness:.4f}, indicating {skew_dir}-skewed distribution",
             )
 
+        # Every failed check adds a reason, so no reasons means normal
+        is_normal = not reasons
+
         return is_normal, reasons
 
 
+# Values per index sent back from worker processes for the comparison plots
+COMPARISON_SAMPLE_SIZE = 50_000
+
+
+def _load_stats(path: str, stream_pixels: int) -> tuple[np.ndarray, dict[str, float]]:
+    """
+    Load a raster's valid data and calculate its statistics.
+
+    Rasters larger than stream_pixels are read block by block, so only a
+    random sample of their data is returned.
+
+    Args:
+        path: Path to the GeoTIFF file
+        stream_pixels: Pixel count above which the raster is streamed
+
+    Returns:
+        Tuple of the valid data, or a sample of it for streamed rasters, and
+        the statistics of all valid data
+    """
+    if StatisticsCalculator.pixel_count(path) > stream_pixels:
+        stats_dict, sample = StatisticsCalculator.stream_stats(
+            path,
+            sample_size=COMPARISON_SAMPLE_SIZE,
+        )
+        return sample, stats_dict
+
+    valid_data, _, _ = StatisticsCalculator.load_raster_data(path)
+    return valid_data, StatisticsCalculator.calculate_basic_stats(valid_data)
+
+
+def _load_and_stat(path: str, stream_pixels: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Load a raster and calculate its statistics in a worker process.
+
+    Args:
+        path: Path to the GeoTIFF file
+        stream_pixels: Pixel count above which the raster is streamed
+
+    Returns:
+        Tuple of a sample of the valid data for plotting and the statistics
+        of all valid data, ordered as StatisticsCalculator.STAT_NAMES
+    """
+    valid_data, stats_dict = _load_stats(path, stream_pixels)
+
+    # Only a sample and a flat row of statistics are pickled back, since the
+    # plots do not need every pixel
+    return (
+        NormalityTester.sample_data(valid_data, COMPARISON_SAMPLE_SIZE),
+        np.array([stats_dict[name] for name in StatisticsCalculator.STAT_NAMES]),
+    )
+
+
 class GeospatialVisualizer:
     """Generate visualizations for geospatial data distribution analysis."""
 
+    HISTOGRAM_BINS = 50
+
+    # Grid points of the binned density estimate
+    KDE_GRID_SIZE = 512
+
+    # Resolution of saved plots
+    DEFAULT_DPI = 150
+
+    # Figure and axes reused by every distribution plot. The pool is shared
+    # by all instances without locking, so it is not thread-safe
+    _pooled_fig: ClassVar[tuple[plt.Figure, np.ndarray] | None] = None
+
+    @classmethod
+    def _distribution_figure(cls) -> tuple[plt.Figure, np.ndarray]:
+        """
+        Get the pooled 2x2 distribution figure with its axes cleared.
+
+        Building a figure and its axes costs far more than clearing them, so
+        one figure is kept and redrawn for each raster. The figure is created
+        again if it was closed in the meantime. It is shared process-wide, so
+        distribution plots must not be drawn from several threads at once.
+
+        Returns:
+            Tuple of the figure and its 2x2 array of axes
+        """
+        if cls._pooled_fig is None or not plt.fignum_exists(cls._pooled_fig[0].number):
+            cls._pooled_fig = plt.subplots(2, 2, figsize=(15, 12))
+
+        fig, axes = cls._pooled_fig
+        for ax in axes.ravel():
+            ax.cla()
+        return fig, axes
+
+    @classmethod
+    def _density_curve(
+        cls,
+        data: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Estimate a Gaussian kernel density curve of the data.
+
+        The data are binned onto a fixed grid and the bin counts convolved
+        with the kernel by FFT, so the cost grows with the data size plus the
+        grid size rather than their product, and every value can be used.
+
+        Args:
+            data: Data array
+
+        Returns:
+            Tuple of grid points and densities, or None if the data has no
+            spread to estimate a density from
+        """
+        n = len(data)
+        std = data.std()
+        if n < 2 or std == 0:
+            return None
+
+        # Scott's rule, as used by scipy's gaussian_kde; extend the grid by
+        # three bandwidths so the tails are not cut off
+        bandwidth = std * n ** (-1 / 5)
+        counts, edges = np.histogram(
+            data,
+            bins=cls.KDE_GRID_SIZE,
+            range=(data.min() - 3 * bandwidth, data.max() + 3 * bandwidth),
+        )
+        step = edges[1] - edges[0]
+
+        half_width = min(int(np.ceil(4 * bandwidth / step)), cls.KDE_GRID_SIZE)
+        offsets = np.arange(-half_width, half_width + 1) * step
+        kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+
+        density = signal.fftconvolve(counts, kernel, mode="same")
+        density = np.clip(density, 0, None) / (n * bandwidth * np.sqrt(2 * np.pi))
+        return edges[:-1] + step / 2, density
+
+    @classmethod
+    def _plot_histogram(cls, ax: plt.Axes, data: np.ndarray) -> None:
+        """
+        Plot a histogram of the data with a density curve on top.
+
+        Args:
+            ax: Axes to plot on
+            data: Data array
+        """
+        _, edges, _ = ax.hist(data, bins=cls.HISTOGRAM_BINS)
+
+        # Scale the density to the bar heights so both share the count axis
+        if curve := cls._density_curve(data):
+            x, density = curve
+            ax.plot(x, density * len(data) * (edges[1] - edges[0]))
+
     @staticmethod
+    def _qq_points(
+        data: np.ndarray,
+        max_points: int = 5000,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the points of a normal Q-Q plot.
+
+        Args:
+            data: Data array
+            max_points: Maximum number of values to use
+
+        Returns:
+            Tuple of theoretical normal quantiles and ordered sample values
+        """
+        ordered = np.sort(NormalityTester.sample_data(data, max_points))
+        n = len(ordered)
+        theoretical = special.ndtri((np.arange(1, n + 1) - 0.5) / n)
+        return theoretical, ordered
+
+    @classmethod
+    def _plot_qq(cls, ax: plt.Axes, data: np.ndarray, max_points: int = 5000) -> None:
+        """
+        Plot sample quantiles against normal quantiles with a fitted line.
+
+        Args:
+            ax: Axes to plot on
+            data: Data array
+            max_points: Maximum number of values to plot
+        """
+        theoretical, ordered = cls._qq_points(data, max_points)
+        slope, intercept = np.polyfit(theoretical, ordered, 1)
+
+        ax.scatter(theoretical, ordered, s=2)
+        ax.plot(theoretical, slope * theoretical + intercept, color="red")
+        ax.set_xlabel("Theoretical quantiles")
+        ax.set_ylabel("Ordered Values")
+
+    @classmethod
     def create_distribution_plots(
+        cls,
         data: np.ndarray,
         file_name: str,
         stats_dict: dict[str, float],
@@ -219,6 +668,9 @@ class GeospatialVisualizer:
         """
         Create a set of distribution plots for the data.
 
+        The plots are drawn on a pooled figure, so save it before creating the
+        plots for the next raster.
+
         Args:
             data: Data array
             file_name: Name of the file for titles
@@ -227,10 +679,10 @@ class GeospatialVisualizer:
         Returns:
             Matplotlib figure with plots
         """
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        fig, axes = cls._distribution_figure()
 
         # Histogram with KDE
-        sns.histplot(data, kde=True, ax=axes[0, 0])
+        cls._plot_histogram(axes[0, 0], data)
         axes[0, 0].set_title(f"{file_name} - Histogram with Density Curve")
         axes[0, 0].set_xlabel("Value")
         axes[0, 0].set_ylabel("Frequency")
@@ -251,25 +703,46 @@ class GeospatialVisualizer:
         axes[0, 0].legend()
 
         # Q-Q Plot
-        stats.probplot(data, dist="norm", plot=axes[0, 1])
+        cls._plot_qq(axes[0, 1], data)
         axes[0, 1].set_title(f"{file_name} - Q-Q Plot")
 
-        # Box Plot
-        sns.boxplot(y=data, ax=axes[1, 0])
+        # Box Plot drawn from the precomputed quartiles, with whiskers at
+        # 1.5 IQR clipped to the data range
+        iqr = stats_dict["iqr"]
+        axes[1, 0].bxp(
+            [
+                {
+                    "med": stats_dict["median"],
+                    "q1": stats_dict["percentile_25"],
+                    "q3": stats_dict["percentile_75"],
+                    "whislo": max(
+                        stats_dict["min"],
+                        stats_dict["percentile_25"] - 1.5 * iqr,
+                    ),
+                    "whishi": min(
+                        stats_dict["max"],
+                        stats_dict["percentile_75"] + 1.5 * iqr,
+                    ),
+                    "fliers": [],
+                },
+            ],
+        )
         axes[1, 0].set_title(f"{file_name} - Box Plot")
         axes[1, 0].set_ylabel("Value")
 
         # Kernel Density Estimation
-        sns.kdeplot(data, ax=axes[1, 1])
+        if curve := cls._density_curve(data):
+            axes[1, 1].plot(*curve)
         axes[1, 1].set_title(f"{file_name} - Density Distribution")
         axes[1, 1].set_xlabel("Value")
         axes[1, 1].set_ylabel("Density")
 
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
 
-    @staticmethod
+    @classmethod
     def create_comparison_plots(
+        cls,
         data_dict: dict[str, np.ndarray],
         stats_dict: dict[str, dict[str, float]],
     ) -> plt.Figure:
@@ -291,7 +764,7 @@ class GeospatialVisualizer:
 
         for i, (index_name, data) in enumerate(data_dict.items()):
             # Histogram with KDE
-            sns.histplot(data, kde=True, ax=axes[i, 0])
+            cls._plot_histogram(axes[i, 0], data)
             axes[i, 0].set_title(f"{index_name} - Distribution")
             axes[i, 0].set_xlabel("Value")
             axes[i, 0].set_ylabel("Frequency")
@@ -312,35 +785,102 @@ class GeospatialVisualizer:
             axes[i, 0].legend()
 
             # Q-Q Plot
-            stats.probplot(data, dist="norm", plot=axes[i, 1])
+            cls._plot_qq(axes[i, 1], data)
             axes[i, 1].set_title(f"{index_name} - Q-Q Plot")
 
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
 
-    @staticmethod
-    def save_plot(fig: plt.Figure, output_path: str) -> None:
+    @classmethod
+    def save_plot(
+        cls,
+        fig: plt.Figure,
+        output_path: str,
+        dpi: int | None = None,
+    ) -> None:
         """
         Save a matplotlib figure to a file.
 
         Args:
             fig: Matplotlib figure
             output_path: Path to save the plot
+            dpi: Resolution of the saved image (default: DEFAULT_DPI)
         """
-        fig.savefig(output_path, dpi=300)
+        fig.savefig(output_path, dpi=dpi or cls.DEFAULT_DPI)
 
 
 class VegetationIndexAnalyzer:
     """Main class for analyzing vegetation indices."""
 
-    def __init__(self, output_dir: str | None = None):
+    # Context printed after the analysis of each known index
+    INDEX_CONTEXT: ClassVar[dict[str, tuple[str, ...]]] = {
+        "MSI": (
+            "MSI (Moisture Stress Index) typically shows right-skewed distribution in most ecosystems,",
+            "with many values at the lower end (less stressed vegetation) and fewer high values (highly stressed vegetation).",
+        ),
+        "LAI": (
+            "LAI (Leaf Area Index) often follows non-normal distributions in natural landscapes,",
+            "especially when the study area contains mixed vegetation types.",
+        ),
+        "EVI": (
+            "EVI (Enhanced Vegetation Index) frequently exhibits bimodal or skewed distributions,",
+            "particularly in areas with both vegetated and non-vegetated regions.",
+        ),
+    }
+    # Summary lines printed for each analyzed index, filled from its statistics
+    ANALYSIS_TEMPLATES = (
+        "Mean: {mean:.4f}",
+        "Median: {median:.4f}",
+        "Standard Deviation: {std:.4f}",
+        "Skewness: {skewness:.4f}",
+        "Kurtosis: {kurtosis:.4f}",
+    )
+    # Typical value ranges printed after every comparison
+    TYPICAL_RANGES: ClassVar[dict[str, str]] = {
+        "LAI": "0-8 m²/m² (most natural vegetation: 0.5-5)",
+        "EVI": "-1 to +1 (healthy vegetation: 0.2-0.8)",
+        "MSI": "0.4-2 (lower values indicate less water stress)",
+    }
+    # Bumped whenever the cached analysis changes shape or meaning
+    CACHE_VERSION = 1
+    # Total pixel count below which rasters are analyzed in this process,
+    # since spawning workers and importing the analysis modules in each
+    # costs more than the analysis of small rasters saves
+    POOL_PIXEL_THRESHOLD = 10_000_000
+
+    # Finds index names anywhere in a file name, whatever their case
+    _INDEX_NAME_RE = re.compile("|".join(INDEX_CONTEXT), re.IGNORECASE)
+    # Matches the metric suffix the pipeline gives raster names, so that area
+    # names or prefixes containing an index name are not mistaken for it
+    _INDEX_SUFFIX_RE = re.compile(f"_({'|'.join(INDEX_CONTEXT)})$", re.IGNORECASE)
+
+    def __init__(
+        self,
+        output_dir: str | None = None,
+        plot_dpi: int | None = None,
+        use_cache: bool = False,
+        stream_pixels: int | None = None,
+    ):
         """
         Initialize the analyzer.
 
         Args:
             output_dir: Directory to save analysis results
+            plot_dpi: Resolution of saved plots (default: visualizer default)
+            use_cache: Whether to reuse the saved analysis of rasters that are
+                unchanged and were analyzed with the same settings. The cache
+                is kept in a hidden .cache directory inside output_dir
+            stream_pixels: Pixel count above which rasters are read block by
+                block (default: StatisticsCalculator.STREAM_PIXEL_THRESHOLD)
         """
         self.output_dir = output_dir
+        self.plot_dpi = plot_dpi
+        self.use_cache = use_cache
+        self.stream_pixels = (
+            StatisticsCalculator.STREAM_PIXEL_THRESHOLD
+            if stream_pixels is None
+            else stream_pixels
+        )
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
 
@@ -348,25 +888,125 @@ class VegetationIndexAnalyzer:
         self.normality_tester = NormalityTester()
         self.visualizer = GeospatialVisualizer()
 
-    def analyze_index(self, geotiff_path: str) -> dict[str, float]:
+    def _cache_key(self, geotiff_path: str) -> dict[str, Any] | None:
         """
-        Analyze a single vegetation index.
+        Identify a raster's contents and the settings it is analyzed with.
 
         Args:
             geotiff_path: Path to the GeoTIFF file
 
         Returns:
-            Dictionary with statistics
+            Dictionary of the cache format version, the raster's resolved
+            path, modification time and size, and every setting that affects
+            the saved analysis, or None if the file cannot be inspected
         """
-        # Extract file name without extension
-        file_name = Path(geotiff_path).stem
-        print(f"Analyzing distribution for {file_name}...")
+        try:
+            stat = os.stat(geotiff_path)
+        except OSError:
+            return None
+
+        return {
+            "version": self.CACHE_VERSION,
+            "raster": [os.path.realpath(geotiff_path), stat.st_mtime_ns, stat.st_size],
+            "settings": {
+                "plot_dpi": self.plot_dpi or GeospatialVisualizer.DEFAULT_DPI,
+                "histogram_bins": GeospatialVisualizer.HISTOGRAM_BINS,
+                "kde_grid_size": GeospatialVisualizer.KDE_GRID_SIZE,
+                "stream_pixels": self.stream_pixels,
+                "stream_sample_size": COMPARISON_SAMPLE_SIZE,
+                "max_sample": NormalityTester.MAX_SAMPLE,
+                "shapiro_max_sample": NormalityTester.SHAPIRO_MAX_SAMPLE,
+            },
+        }
+
+    def _cache_file(self, file_name: str) -> Path | None:
+        """
+        Get the path of the cached analysis of a raster.
+
+        Args:
+            file_name: Name of the raster file without extension
+
+        Returns:
+            Path of the cache file, or None if caching is disabled
+        """
+        if not (self.use_cache and self.output_dir):
+            return None
+        return Path(self.output_dir) / ".cache" / f"{file_name}.json"
+
+    def _load_cached_stats(
+        self,
+        file_name: str,
+        cache_key: dict[str, Any] | None,
+    ) -> dict[str, float] | None:
+        """
+        Load the cached analysis of a raster if it is still valid.
+
+        The cache is only used while the raster and the analysis settings are
+        unchanged and the plot and CSV written with it are still in place.
+
+        Args:
+            file_name: Name of the raster file without extension
+            cache_key: Current identity of the raster file and settings
+
+        Returns:
+            Dictionary with statistics, or None if there is no valid cache
+        """
+        cache_file = self._cache_file(file_name)
+        if cache_file is None or cache_key is None or not cache_file.exists():
+            return None
+
+        output_dir = cache_file.parent.parent
+        outputs = (
+            output_dir / f"{file_name}_distribution_analysis.png",
+            output_dir / f"{file_name}_statistics.csv",
+        )
+        if not all(output.exists() for output in outputs):
+            return None
+
+        try:
+            cached = json.loads(cache_file.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if cached.get("key") != cache_key:
+            return None
+        return cached["stats"]
+
+    def _store_cached_stats(
+        self,
+        file_name: str,
+        cache_key: dict[str, Any] | None,
+        stats_dict: dict[str, float],
+    ) -> None:
+        """
+        Save the analysis of a raster for reuse while its cache key matches.
+
+        Args:
+            file_name: Name of the raster file without extension
+            cache_key: Current identity of the raster file and settings
+            stats_dict: Dictionary with statistics
+        """
+        cache_file = self._cache_file(file_name)
+        if cache_file is None or cache_key is None:
+            return
 
-        # Load data
-        valid_data, _, _ = StatisticsCalculator.load_raster_data(geotiff_path)
+        cache_file.parent.mkdir(exist_ok=True)
+        cache_file.write_text(json.dumps({"key": cache_key, "stats": stats_dict}))
+
+    def _run_analysis(self, geotiff_path: str, file_name: str) -> dict[str, float]:
+        """
+        Calculate the statistics of a raster and save its plots and CSV.
+
+        Args:
+            geotiff_path: Path to the GeoTIFF file
+            file_name: Name of the raster file without extension
 
-        # Calculate statistics
-        stats_dict = StatisticsCalculator.calculate_basic_stats(valid_data)
+        Returns:
+            Dictionary with statistics and normality test results
+        """
+        # Load data and calculate statistics; large rasters are streamed and
+        # only a sample of them is tested and plotted
+        valid_data, stats_dict = _load_stats(geotiff_path, self.stream_pixels)
 
         # Run normality tests
         normality_results = self.normality_tester.run_all_tests(valid_data)
@@ -382,13 +1022,51 @@ class VegetationIndexAnalyzer:
             self.visualizer.save_plot(
                 fig,
                 os.path.join(self.output_dir, f"{file_name}_distribution_analysis.png"),
+                dpi=self.plot_dpi,
             )
 
-            # Save statistics to CSV
-            pd.DataFrame([stats_dict]).to_csv(
+            # Save statistics to CSV; a single row needs no DataFrame. Missing
+            # values are left empty, as pandas writes them
+            with open(
                 os.path.join(self.output_dir, f"{file_name}_statistics.csv"),
-                index=False,
-            )
+                "w",
+                newline="",
+            ) as f:
+                writer = csv.DictWriter(f, fieldnames=list(stats_dict))
+                writer.writeheader()
+                writer.writerow(
+                    {
+                        name: ""
+                        if isinstance(value, float) and math.isnan(value)
+                        else value
+                        for name, value in stats_dict.items()
+                    },
+                )
+
+        return stats_dict
+
+    def analyze_index(self, geotiff_path: str) -> dict[str, float]:
+        """
+        Analyze a single vegetation index.
+
+        Args:
+            geotiff_path: Path to the GeoTIFF file
+
+        Returns:
+            Dictionary with statistics
+        """
+        # Extract file name without extension
+        file_name = Path(geotiff_path).stem
+        print(f"Analyzing distribution for {file_name}...")
+
+        # Reuse the previous analysis if the raster and settings are unchanged
+        cache_key = self._cache_key(geotiff_path)
+        stats_dict = self._load_cached_stats(file_name, cache_key)
+        if stats_dict is not None:
+            print(f"Using cached analysis for {file_name}")
+        else:
+            stats_dict = self._run_analysis(geotiff_path, file_name)
+            self._store_cached_stats(file_name, cache_key, stats_dict)
 
         # Determine if distribution is normal
         is_normal, reasons = self.normality_tester.interpret_normality(stats_dict)
@@ -408,33 +1086,59 @@ class VegetationIndexAnalyzer:
         Returns:
             DataFrame with statistics for all indices
         """
-        # Store statistics and data for each index
-        all_stats = {}
+        # Store statistics as one row per index and data for each index
+        table = np.empty((len(geotiff_paths), len(StatisticsCalculator.STAT_NAMES)))
         all_data = {}
 
-        # Analyze each index
-        for index_name, path in geotiff_paths.items():
-            print(f"\nAnalyzing {index_name}...")
-
-            # Load data
-            valid_data, _, _ = StatisticsCalculator.load_raster_data(path)
-            all_data[index_name] = valid_data
-
-            # Calculate statistics
-            all_stats[index_name] = StatisticsCalculator.calculate_basic_stats(
-                valid_data,
-            )
+        # Each raster is loaded and analyzed independently, so large inputs
+        # are spread across processes. They are spawned rather than forked,
+        # since forking a process that already runs threads, such as the
+        # pipeline's I/O pool, can deadlock the children
+        print(f"\nAnalyzing {', '.join(geotiff_paths)}...")
+        load_and_stat = partial(_load_and_stat, stream_pixels=self.stream_pixels)
+        paths = list(geotiff_paths.values())
+        if (
+            len(paths) <= 1
+            or sum(map(StatisticsCalculator.pixel_count, paths))
+            < self.POOL_PIXEL_THRESHOLD
+        ):
+            results = list(map(load_and_stat, paths))
+        else:
+            max_workers = min(len(paths), os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                results = list(executor.map(load_and_stat, paths))
+
+        for row, index_name, (data_sample, stats_row) in zip(
+            table,
+            geotiff_paths,
+            results,
+        ):
+            all_data[index_name] = data_sample
+            row[:] = stats_row
+
+        # Create statistics DataFrame from the filled table in one go
+        stats_df = pd.DataFrame(
+            table,
+            index=list(geotiff_paths),
+            columns=list(StatisticsCalculator.STAT_NAMES),
+        ).astype({"count": int})
 
         # Create comparison visualizations
         if self.output_dir:
+            all_stats = {
+                index_name: dict(zip(StatisticsCalculator.STAT_NAMES, row))
+                for index_name, row in zip(geotiff_paths, table)
+            }
             fig = self.visualizer.create_comparison_plots(all_data, all_stats)
             self.visualizer.save_plot(
                 fig,
                 os.path.join(self.output_dir, "index_comparison.png"),
+                dpi=self.plot_dpi,
             )
-
-        # Create statistics DataFrame
-        stats_df = pd.DataFrame.from_dict(all_stats, orient="index")
+            plt.close(fig)
 
         # Save to CSV if output directory specified
         if self.output_dir:
@@ -445,6 +1149,33 @@ class VegetationIndexAnalyzer:
 
         return stats_df
 
+    @staticmethod
+    def _index_name(file_name: str) -> str | None:
+        """
+        Identify the index with printed context that a raster file holds.
+
+        The pipeline's _<INDEX> suffix takes precedence. Otherwise the index
+        name may appear anywhere in the file name in any case, and the first
+        of INDEX_CONTEXT found is used.
+
+        Args:
+            file_name: Name of the raster file without extension
+
+        Returns:
+            Key of INDEX_CONTEXT, or None if the file name contains none
+        """
+        if match := VegetationIndexAnalyzer._INDEX_SUFFIX_RE.search(file_name):
+            return match.group(1).upper()
+
+        found = {
+            name.upper()
+            for name in VegetationIndexAnalyzer._INDEX_NAME_RE.findall(file_name)
+        }
+        return next(
+            (name for name in VegetationIndexAnalyzer.INDEX_CONTEXT if name in found),
+            None,
+        )
+
     @staticmethod
     def _print_analysis_results(
         file_name: str,
@@ -461,12 +1192,11 @@ class VegetationIndexAnalyzer:
             is_normal: Whether the distribution is normal
             reasons: Reasons if the distribution is not normal
         """
-        print("\n=== Distribution Analysis Results ===")
-        print(f"Mean: {stats_dict['mean']:.4f}")
-        print(f"Median: {stats_dict['median']:.4f}")
-        print(f"Standard Deviation: {stats_dict['std']:.4f}")
-        print(f"Skewness: {stats_dict['skewness']:.4f}")
-        print(f"Kurtosis: {stats_dict['kurtosis']:.4f}")
+        summary = "\n".join(
+            template.format_map(stats_dict)
+            for template in VegetationIndexAnalyzer.ANALYSIS_TEMPLATES
+        )
+        print("\n=== Distribution Analysis Results ===\n" + summary)
 
         print("\nNormality Assessment:")
         if is_normal:
@@ -478,25 +1208,10 @@ class VegetationIndexAnalyzer:
 
         # Provide context specific to vegetation indices
         print("\nVegetation Index Context:")
-        if file_name.upper().find("MSI") >= 0:
-            print(
-                "MSI (Moisture Stress Index) typically shows right-skewed distribution in most ecosystems,",
-            )
-            print(
-                "with many values at the lower end (less stressed vegetation) and fewer high values (highly stressed vegetation).",
-            )
-        elif file_name.upper().find("LAI") >= 0:
-            print(
-                "LAI (Leaf Area Index) often follows non-normal distributions in natural landscapes,",
-            )
-            print("especially when the study area contains mixed vegetation types.")
-        elif file_name.upper().find("EVI") >= 0:
-            print(
-                "EVI (Enhanced Vegetation Index) frequently exhibits bimodal or skewed distributions,",
-            )
-            print(
-                "particularly in areas with both vegetated and non-vegetated regions.",
-            )
+        index_name = VegetationIndexAnalyzer._index_name(file_name)
+        if index_name:
+            for line in VegetationIndexAnalyzer.INDEX_CONTEXT[index_name]:
+                print(line)
 
     @staticmethod
     def _print_comparison_results(stats_df: pd.DataFrame) -> None:
@@ -511,9 +1226,12 @@ class VegetationIndexAnalyzer:
 
         # Print expected ranges for common indices
         print("\nTypical ranges for vegetation indices:")
-        print("- LAI: 0-8 m²/m² (most natural vegetation: 0.5-5)")
-        print("- EVI: -1 to +1 (healthy vegetation: 0.2-0.8)")
-        print("- MSI: 0.4-2 (lower values indicate less water stress)")
+        print(
+            "\n".join(
+                f"- {name}: {typical_range}"
+                for name, typical_range in VegetationIndexAnalyzer.TYPICAL_RANGES.items()
+            ),
+        )
 
 
 # Example usage:
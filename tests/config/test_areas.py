@@ -16,7 +16,10 @@ mock_ee.Filter.eq.return_value = {
 # Apply the mock to the ee module
 with mock.patch.dict("sys.modules", {"ee": mock_ee}):
     # Now we can import the areas module
-    from config.areas import AREAS, get_area
+    from config.areas import AREAS, get_area, get_area_bounds_coords
+
+# Geometry calls made while importing the module
+IMPORT_TIME_CALLS = mock_ee.FeatureCollection.call_count
 
 
 class TestAreas:
@@ -27,8 +30,16 @@ class TestAreas:
         # Get the area for "finland"
         result = get_area("finland")
 
-        # Assert that we got the correct area from the AREAS dictionary
-        assert result == AREAS["finland"]
+        # Assert that we got the geometry built by the AREAS entry
+        assert (
+            result
+            == mock_ee.FeatureCollection.return_value.filter.return_value.geometry.return_value
+        )
+        mock_ee.FeatureCollection.assert_called_with("FAO/GAUL/2015/level0")
+
+    def test_areas_built_lazily(self):
+        """Test that importing the module builds no Earth Engine objects."""
+        assert IMPORT_TIME_CALLS == 0
 
     def test_get_area_invalid(self):
         """Test retrieval of an invalid area raises ValueError."""
@@ -48,3 +59,34 @@ class TestAreas:
 
         # Check that "finland" is in AREAS
         assert "finland" in AREAS
+        assert callable(AREAS["finland"])
+
+    def test_get_area_accepts_geometry_entry(self):
+        """Test that an entry holding a geometry is returned as is."""
+        geometry = object()
+
+        with mock.patch.dict(AREAS, {"eager_area": geometry}):
+            assert get_area("eager_area") is geometry
+        get_area.cache_clear()
+
+    def test_get_area_bounds_coords(self):
+        """Test that area bounds are fetched once and then cached."""
+        coordinates = [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
+        bounds = get_area("finland").bounds.return_value
+        bounds.getInfo.return_value = {"type": "Polygon", "coordinates": coordinates}
+        get_area_bounds_coords.cache_clear()
+
+        first = get_area_bounds_coords("finland")
+        second = get_area_bounds_coords("finland")
+
+        assert first == coordinates
+        assert second is first
+        assert bounds.getInfo.call_count == 1
+
+    def test_get_area_bounds_coords_no_bounds(self):
+        """Test that missing bounds are reported as None."""
+        get_area("finland").bounds.return_value.getInfo.return_value = None
+        get_area_bounds_coords.cache_clear()
+
+        assert get_area_bounds_coords("finland") is None
+        get_area_bounds_coords.cache_clear()
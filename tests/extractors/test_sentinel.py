@@ -10,6 +10,8 @@ class MockEEImageCollection:
     def __init__(self, collection_id=None):
         self.filters = []
         self.collection_id = collection_id
+        self.selected_bands = None
+        self.mapped_functions = []
 
     def filterDate(self, start_date, end_date):
         self.filters.append(("date", start_date, end_date))
@@ -23,6 +25,14 @@ class MockEEImageCollection:
         self.filters.append(("filter", ee_filter))
         return self
 
+    def select(self, bands):
+        self.selected_bands = bands
+        return self
+
+    def map(self, func):
+        self.mapped_functions.append(func)
+        return self
+
 
 class MockEEDate:
     """Mock for Earth Engine Date objects"""
@@ -68,6 +78,7 @@ def mock_ee():
 
 # Import the module under test after setting up the EE mock
 from src.extractors.sentinel import get_sentinel_data  # noqa: E402
+from src.processors.preprocessing import mask_clouds
 
 
 class TestSentinelExtractor:
@@ -137,3 +148,39 @@ class TestSentinelExtractor:
 
         # Verify the bounds filter is applied correctly
         assert result.filters[1] == ("bounds", area)
+
+    def test_get_sentinel_data_band_selection(self, mock_ee):
+        """Test that only the needed bands are kept and clouds are masked"""
+        # Setup test inputs
+        start_date = MockEEDate("2023-01-01")
+        end_date = MockEEDate("2023-01-31")
+        area = MockEEGeometry()
+
+        # Call the function under test
+        result = get_sentinel_data(start_date, end_date, area)
+
+        # Verify the metric bands and QA band are selected
+        assert result.selected_bands == ["B2", "B4", "B8", "B11", "QA60"]
+
+        # Verify the QA60 cloud mask is applied to each image
+        assert result.mapped_functions == [mask_clouds]
+
+    def test_get_sentinel_data_cloud_settings(self, mock_ee):
+        """Test a custom cloud threshold and disabled pixel masking"""
+        # Setup test inputs
+        start_date = MockEEDate("2023-01-01")
+        end_date = MockEEDate("2023-01-31")
+        area = MockEEGeometry()
+
+        # Call the function under test
+        result = get_sentinel_data(
+            start_date,
+            end_date,
+            area,
+            max_cloud_percentage=10,
+            cloud_masking=False,
+        )
+
+        # Verify the scene filter uses the threshold and no mask is mapped
+        assert result.filters[2][1]["value"] == 10
+        assert result.mapped_functions == []
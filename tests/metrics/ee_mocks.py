@@ -0,0 +1,49 @@
+"""Mock of the ee.Image band arithmetic shared by the metrics tests."""
+
+
+class MockBand:
+    def __init__(self, value, name=None):
+        self.value = value
+        self.name = name
+
+    def _value_of(self, other):
+        return other.value if isinstance(other, MockBand) else other
+
+    def add(self, other):
+        return MockBand(self.value + self._value_of(other))
+
+    def subtract(self, other):
+        return MockBand(self.value - self._value_of(other))
+
+    def multiply(self, other):
+        return MockBand(self.value * self._value_of(other))
+
+    def divide(self, other):
+        # Like Earth Engine, division by zero yields zero
+        divisor = self._value_of(other)
+        return MockBand(self.value / divisor if divisor else 0)
+
+    def rename(self, name):
+        return MockBand(self.value, name)
+
+
+class MockImage:
+    def __init__(self, bands=None):
+        self.bands = bands or {}
+
+    def select(self, band_name):
+        return self.bands.get(band_name, MockBand(0))
+
+    def addBands(self, image):
+        # Create a new image with bands from both images
+        new_bands = self.bands.copy()
+        if isinstance(image, MockImage):
+            new_bands.update(image.bands)
+        else:
+            # Assume it's a single named band
+            new_bands[image.name or "unnamed"] = image
+        return MockImage(new_bands)
+
+    @staticmethod
+    def cat(bands):
+        return MockImage({band.name: band for band in bands})
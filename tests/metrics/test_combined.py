@@ -0,0 +1,76 @@
+from unittest import mock
+
+from tests.metrics.ee_mocks import MockBand, MockImage
+
+# Mock the ee module
+mock_ee = mock.Mock()
+mock_ee.Image = MockImage
+
+# Apply the mock to the ee module
+with mock.patch.dict("sys.modules", {"ee": mock_ee}):
+    # Import the combined metrics module
+    from src.metrics.combined import (
+        calculate_metrics,
+        get_metric_band_names,
+        get_required_bands,
+    )
+
+
+def make_image():
+    """Create a mock Sentinel-2 image with realistic reflectance values"""
+    return MockImage(
+        {
+            "B2": MockBand(1000),  # BLUE
+            "B4": MockBand(2000),  # RED
+            "B8": MockBand(5000),  # NIR
+            "B11": MockBand(3000),  # SWIR
+        },
+    )
+
+
+class TestCombinedMetrics:
+    """Tests for the combined metrics module."""
+
+    def test_calculate_all_metrics(self):
+        """Test that all metric bands are added with the expected values."""
+        result = calculate_metrics(make_image(), ["EVI", "LAI", "MSI"])
+
+        # EVI = 2.5 * (0.5 - 0.2) / (0.5 + 6 * 0.2 - 7.5 * 0.1 + 1)
+        expected_evi = 2.5 * 0.3 / 1.95
+        assert abs(result.bands["EVI"].value - expected_evi) < 1e-9
+        assert abs(result.bands["LAI"].value - (3.618 * expected_evi - 0.118)) < 1e-9
+        assert abs(result.bands["MSI"].value - 0.6) < 1e-9
+
+        # Original bands are preserved
+        assert {"B2", "B4", "B8", "B11"} <= set(result.bands)
+
+    def test_calculate_lai_without_evi(self):
+        """Test that LAI can be requested without keeping the EVI band."""
+        result = calculate_metrics(make_image(), ["LAI"])
+
+        assert "LAI" in result.bands
+        assert "EVI" not in result.bands
+        assert "MSI" not in result.bands
+
+    def test_calculate_no_metrics(self):
+        """Test that the image is returned unchanged when no metrics match."""
+        image = make_image()
+
+        assert calculate_metrics(image, ["NDVI"]) is image
+
+    def test_get_metric_band_names(self):
+        """Test that the band names match the bands calculate_metrics adds."""
+        metrics = ["MSI", "LAI", "NDVI"]
+        result = calculate_metrics(make_image(), metrics)
+
+        band_names = get_metric_band_names(metrics)
+
+        assert band_names == ["LAI", "MSI"]
+        assert set(band_names) == set(result.bands) - set(make_image().bands)
+
+    def test_get_required_bands(self):
+        """Test that only the input bands of the requested metrics are listed."""
+        assert get_required_bands(["EVI"]) == ["B2", "B4", "B8"]
+        assert get_required_bands(["MSI"]) == ["B8", "B11"]
+        assert get_required_bands(["EVI", "LAI", "MSI"]) == ["B2", "B4", "B8", "B11"]
+        assert get_required_bands(["NDVI"]) == []
@@ -1,56 +1,6 @@
 from unittest import mock
 
-
-# Create mock classes for testing
-class MockBand:
-    def __init__(self, value):
-        self.value = value
-
-    def divide(self, divisor):
-        # Return a new mock band with the divided value
-        return MockBand(self.value / divisor)
-
-
-class MockImage:
-    def __init__(self, bands=None):
-        self.bands = bands or {}
-
-    def select(self, band_name):
-        return self.bands.get(band_name, MockBand(0))
-
-    def expression(self, expression, variables):
-        # For MSI, we can implement a simplified calculation
-        # that mimics the real behavior for better testing
-        if "SWIR / NIR" in expression and "SWIR" in variables and "NIR" in variables:
-            swir_value = (
-                variables["SWIR"].value if hasattr(variables["SWIR"], "value") else 0
-            )
-            nir_value = (
-                variables["NIR"].value if hasattr(variables["NIR"], "value") else 1
-            )
-            # Avoid division by zero
-            msi_value = swir_value / nir_value if nir_value else 0
-            return MockImage({"result": MockBand(msi_value)})
-        return MockImage({"result": MockBand(0)})
-
-    def rename(self, name):
-        # Return a copy of self with the "result" band renamed
-        new_image = MockImage(self.bands.copy())
-        if "result" in new_image.bands:
-            new_image.bands[name] = new_image.bands["result"]
-            del new_image.bands["result"]
-        return new_image
-
-    def addBands(self, image):
-        # Create a new image with bands from both images
-        new_bands = self.bands.copy()
-        if isinstance(image, MockImage):
-            new_bands.update(image.bands)
-        else:
-            # Assume it's a single band with the given name
-            new_bands["unnamed"] = image
-        return MockImage(new_bands)
-
+from tests.metrics.ee_mocks import MockBand, MockImage
 
 # Mock the ee module
 mock_ee = mock.Mock()
@@ -99,9 +49,7 @@ class TestMoistureMetrics:
         # Due to division by 10000 in the function, the expected value is 0.6
         expected_msi = 0.6
 
-        # Our mock implementation has a simplified calculation
-        # We can't directly check the value in the test since our mock doesn't actually compute
-        # but we can verify the band exists and the function runs without errors
+        # The mock bands evaluate the band math, so we can check the value
         assert "MSI" in result.bands
         assert isinstance(result.bands["MSI"], MockBand)
         # Assert msi_value is close to expected value
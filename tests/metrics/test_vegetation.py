@@ -1,54 +1,6 @@
 from unittest import mock
 
-
-# Create a detailed mock of ee.Image functionality
-class MockBand:
-    def __init__(self, value):
-        self.value = value
-
-    def divide(self, divisor):
-        # Return a new mock band with the divided value
-        return MockBand(self.value / divisor)
-
-
-class MockImage:
-    def __init__(self, bands=None):
-        self.bands = bands or {}
-
-    def select(self, band_name):
-        return self.bands.get(band_name, MockBand(0))
-
-    def expression(self, expression, variables):
-        # Simple mock that pretends to compute the expression
-        # In a real test, we could implement more realistic logic here
-        return MockImage({"result": MockBand(0.5)})
-
-    def rename(self, name):
-        # Return a copy of self with the "result" band renamed
-        new_image = MockImage(self.bands.copy())
-        if "result" in new_image.bands:
-            new_image.bands[name] = new_image.bands["result"]
-            del new_image.bands["result"]
-        return new_image
-
-    def addBands(self, image):
-        # Create a new image with bands from both images
-        new_bands = self.bands.copy()
-        if isinstance(image, MockImage):
-            new_bands.update(image.bands)
-        else:
-            # Assume it's a single band with the given name
-            new_bands["unnamed"] = image
-        return MockImage(new_bands)
-
-    def divide(self, value):
-        # Image-level divide function creates a new image
-        # with all bands divided by the value
-        new_bands = {}
-        for name, band in self.bands.items():
-            new_bands[name] = MockBand(band.value / value)
-        return MockImage(new_bands)
-
+from tests.metrics.ee_mocks import MockBand, MockImage
 
 # Mock the ee module
 mock_ee = mock.Mock()
@@ -82,6 +34,20 @@ class TestVegetationMetrics:
         # Check that the EVI band was added
         assert "EVI" in result.bands
 
+    def test_calculate_evi_with_realistic_values(self):
+        """Test EVI calculation with realistic values and validate result."""
+        bands = {
+            "B2": MockBand(1000),  # BLUE
+            "B4": MockBand(2000),  # RED
+            "B8": MockBand(5000),  # NIR
+        }
+
+        result = calculate_evi(MockImage(bands))
+
+        # EVI = 2.5 * (0.5 - 0.2) / (0.5 + 6 * 0.2 - 7.5 * 0.1 + 1)
+        expected_evi = 2.5 * 0.3 / 1.95
+        assert abs(result.bands["EVI"].value - expected_evi) < 1e-9
+
     def test_calculate_lai(self):
         """Test LAI calculation."""
         # Create a mock image with EVI band
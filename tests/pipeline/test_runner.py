@@ -1,36 +1,57 @@
+import json
 import sys
 from pathlib import Path
+from typing import ClassVar
 from unittest import mock
 
-import pandas as pd
+import numpy as np
 import pytest
+import rasterio  # type: ignore
+from rasterio.transform import from_origin  # type: ignore
 
 
 # Define our mock Earth Engine classes first, so they can be used in the module mocks
 class MockEEImage:
     def __init__(self, bands=None):
         self.bands = bands or {}
+        # The bands never change after construction, so list their names once
+        self.band_names = list(self.bands)
 
     def select(self, band_name):
         return self
 
     def getDownloadURL(self, params):
-        return f"https://example.com/download/{list(self.bands.keys())[0] if self.bands else 'default'}"
+        band = self.band_names[0] if self.band_names else "default"
+        return f"https://example.com/download/{band}"
 
     def bandNames(self):
-        return MockEEList(list(self.bands.keys()))
+        return MockEEList(self.band_names)
 
 
 class MockEEImageCollection:
     def __init__(self, images=None):
         self.images = images or [MockEEImage()]
 
+    def select(self, band_names):
+        return self
+
     def map(self, func):
         # Apply the function to each image (simplified)
         return self
 
+    # Composites are built once and shared, since nothing modifies them
+    MEDIAN = MockEEImage({"EVI": 0.5, "LAI": 2.5, "MSI": 0.9})
+    MEAN = MockEEImage({"EVI": 0.4, "LAI": 2.0, "MSI": 0.8})
+    MOSAIC = MockEEImage({"EVI": 0.6, "LAI": 3.0, "MSI": 1.0})
+
     def median(self):
-        return MockEEImage({"EVI": 0.5, "LAI": 2.5, "MSI": 0.9})
+        return self.MEDIAN
+
+    def mean(self):
+        return self.MEAN
+
+    def mosaic(self):
+        return self.MOSAIC
 
 
 class MockEEFeature:
@@ -42,17 +63,17 @@ class MockEEFeature:
 
 
 class MockEEGeometry:
-    def __init__(self):
-        pass
+    # Shared by every instance; no test modifies it
+    INFO: ClassVar[dict] = {
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+    }
 
     def bounds(self):
         return MockEEGeometry()
 
     def getInfo(self):
-        return {
-            "type": "Polygon",
-            "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
-        }
+        return self.INFO
 
 
 class MockEEDate:
@@ -92,23 +113,27 @@ class MockAreasModule:
     def get_area(area_name):
         return MockEEGeometry()
 
+    @staticmethod
+    def get_area_bounds_coords(area_name):
+        return MockEEGeometry().getInfo()["coordinates"]
+
 
 # Create a proper mock Earth Engine module with classes that can be used for isinstance checks
 class MockEarthEngine:
     def __init__(self):
-        # Create the Date class that can be used in isinstance checks
-        self.Date = type("EEDate", (MockEEDate,), {})
-
-        # For instantiation, we use a factory that returns our mock objects
-        self._date_factory = mock.MagicMock(side_effect=MockEEDate)
+        # The plain class, so dates pass the runner's isinstance checks
+        self.Date = MockEEDate
 
-        # When called as a constructor, use our factory
-        self.Date.__call__ = self._date_factory
+        # Plain constructors where no test inspects the calls
+        self.ImageCollection = lambda *args, **kwargs: MockEEImageCollection()
+        self.FeatureCollection = lambda *args, **kwargs: MockEEFeature()
+        self.Geometry = MockEEGeometry
 
-        # Mock other EE classes
+        # Call-recording mocks for the constructors the tests assert on
         self.Image = mock.MagicMock(side_effect=MockEEImage)
-        self.ImageCollection = mock.MagicMock(return_value=MockEEImageCollection())
-        self.FeatureCollection = mock.MagicMock(return_value=MockEEFeature())
+        self.List = mock.MagicMock(
+            side_effect=lambda items: MockEEList([item.getInfo() for item in items]),
+        )
         self.Initialize = mock.MagicMock()
 
 
@@ -117,44 +142,85 @@ mock_ee = MockEarthEngine()
 mock_areas = MockAreasModule()
 mock_sentinel = mock.MagicMock()
 mock_sentinel.get_sentinel_data = mock.MagicMock(return_value=MockEEImageCollection())
-mock_vegetation = mock.MagicMock()
-mock_vegetation.calculate_evi = mock.MagicMock()
-mock_vegetation.calculate_lai = mock.MagicMock()
-mock_moisture = mock.MagicMock()
-mock_moisture.calculate_msi = mock.MagicMock()
+mock_combined = mock.MagicMock()
+mock_combined.calculate_metrics = mock.MagicMock()
+mock_combined.get_required_bands.return_value = ["B2", "B4", "B8", "B11"]
+mock_combined.get_metric_band_names.side_effect = lambda metrics: [
+    band for band in ("EVI", "LAI", "MSI") if band in metrics
+]
 mock_preprocessing = mock.MagicMock()
 mock_preprocessing.add_date = mock.MagicMock()
 mock_distribution = mock.MagicMock()
 mock_vegetation_analyzer = mock.MagicMock()
 mock_vegetation_analyzer.analyze_index.return_value = {"mean": 0.5, "median": 0.4}
-mock_vegetation_analyzer.compare_indices.return_value = pd.DataFrame(
-    {"mean": {"EVI": 0.5, "LAI": 2.5}, "median": {"EVI": 0.4, "LAI": 2.3}},
-)
+mock_vegetation_analyzer.compare_indices.return_value.to_dict.return_value = {
+    "mean": {"EVI": 0.5, "LAI": 2.5},
+    "median": {"EVI": 0.4, "LAI": 2.3},
+}
 mock_distribution.VegetationIndexAnalyzer.return_value = mock_vegetation_analyzer
 
-# Apply all mocks
-sys.modules["ee"] = mock_ee  # type: ignore
-sys.modules["config.areas"] = mock_areas  # type: ignore
-sys.modules["src.extractors.sentinel"] = mock_sentinel  # type: ignore
-sys.modules["src.metrics.vegetation"] = mock_vegetation  # type: ignore
-sys.modules["src.metrics.moisture"] = mock_moisture  # type: ignore
-sys.modules["src.processors.preprocessing"] = mock_preprocessing  # type: ignore
-sys.modules["src.statistics.distribution"] = mock_distribution  # type: ignore
-
-# Now import the Pipeline class after mocks are in place
-from src.pipeline.runner import Pipeline  # noqa: E402
+# Import the Pipeline class with the mocks in place. They are only installed
+# for the import, so other test modules still see the real modules.
+with mock.patch.dict(
+    sys.modules,
+    {
+        "ee": mock_ee,
+        "config.areas": mock_areas,
+        "src.extractors.sentinel": mock_sentinel,
+        "src.metrics.combined": mock_combined,
+        "src.processors.preprocessing": mock_preprocessing,
+        "src.statistics.distribution": mock_distribution,
+    },
+):
+    sys.modules.pop("src.pipeline.runner", None)
+    from src.pipeline import runner
+
+Pipeline = runner.Pipeline
+_get_executor = runner._get_executor
+
+
+# Output locations shared by the tests; nothing is written there
+OUTPUT_PATH = Path("test_output")
+EVI_TIF = OUTPUT_PATH / "test_finland_20230101_EVI.tif"
+LAI_TIF = OUTPUT_PATH / "test_finland_20230101_LAI.tif"
+
+# Start date passed as an ee.Date; advancing it returns a new date
+START_DATE = mock_ee.Date("2023-01-01")
+
+
+def write_bands(output_file, bands):
+    """Write a stack of bands as a small multi-band GeoTIFF"""
+    with rasterio.open(
+        output_file,
+        "w",
+        driver="GTiff",
+        width=bands.shape[2],
+        height=bands.shape[1],
+        count=bands.shape[0],
+        dtype=bands.dtype,
+        crs="EPSG:4326",
+        transform=from_origin(0, 1, 0.25, 0.25),
+    ) as dst:
+        dst.write(bands)
 
 
 # Create real fixtures for actual test mocking
 @pytest.fixture
 def mock_ee_module():
-    with mock.patch("src.pipeline.runner.ee", mock_ee):
+    with mock.patch.object(runner, "ee", mock_ee):
         yield mock_ee
 
 
 @pytest.fixture
 def mock_httpx_module():
-    with mock.patch("src.pipeline.runner.httpx") as mock_httpx:
+    with (
+        mock.patch.object(runner, "httpx") as mock_httpx,
+        mock.patch.object(
+            runner,
+            "_get_http_client",
+            return_value=mock_httpx,
+        ),
+    ):
         # Mock the stream context manager
         mock_response = mock.MagicMock()
         mock_response.__enter__.return_value.headers.get.return_value = "1000"
@@ -166,18 +232,32 @@ def mock_httpx_module():
         yield mock_httpx
 
 
+class NullFile:
+    """Writable file stand-in that discards everything written to it."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def write(self, data):
+        return len(data)
+
+
 @pytest.fixture
 def mock_file_ops():
     with (
-        mock.patch("builtins.open", mock.mock_open()),
+        mock.patch("builtins.open", lambda *args, **kwargs: NullFile()),
         mock.patch("pathlib.Path.mkdir") as mock_mkdir,
+        mock.patch.object(runner.os, "replace"),
     ):
         yield mock_mkdir
 
 
 @pytest.fixture
 def mock_tqdm_module():
-    with mock.patch("src.pipeline.runner.tqdm") as mock_tqdm:
+    with mock.patch.object(runner, "tqdm") as mock_tqdm:
         mock_progress = mock.MagicMock()
         mock_tqdm.return_value.__enter__.return_value = mock_progress
 
@@ -201,22 +281,40 @@ class TestPipeline:
         config = {
             "area": "finland",
             "metrics": ["EVI", "LAI"],
-            "start_date": mock_ee.Date("2023-01-01"),  # Use our MockEEDate object
+            "start_date": START_DATE,
         }
         pipeline = Pipeline(config)
 
         # Call the method
         result = pipeline._extract_data()
 
-        # Verify sentinel data was requested
+        # Verify sentinel data was requested with the default cloud settings
         assert mock_sentinel.get_sentinel_data.called
+        assert mock_sentinel.get_sentinel_data.call_args.kwargs == {
+            "max_cloud_percentage": 30,
+            "cloud_masking": True,
+        }
         assert isinstance(result, MockEEImageCollection)
 
-    def test_calculate_metrics_evi_lai(self):
-        """Test metric calculation for EVI and LAI"""
+    def test_extract_data_string_start_date(self):
+        """Test that a YAML string start date gets a one month end date"""
+        pipeline = Pipeline({"area": "finland", "start_date": "2023-01-01"})
+
+        # Call the method twice
+        pipeline._extract_data()
+        start_date, end_date, area = mock_sentinel.get_sentinel_data.call_args.args
+        pipeline._extract_data()
+
+        # Verify the dates and the area are resolved once and reused
+        assert start_date == "2023-01-01"
+        assert end_date.date_str.endswith("_advanced")
+        assert mock_sentinel.get_sentinel_data.call_args.args[2] is area
+
+    @pytest.mark.parametrize("metrics", [["EVI", "LAI"], ["MSI"]])
+    def test_calculate_metrics(self, metrics):
+        """Test metric calculation for each supported metric set"""
         # Create pipeline with config
-        config = {"metrics": ["EVI", "LAI"]}
-        pipeline = Pipeline(config)
+        pipeline = Pipeline({"metrics": metrics})
 
         # Create test data
         data = MockEEImageCollection()
@@ -228,27 +326,90 @@ class TestPipeline:
         assert isinstance(result, MockEEImage)
         assert "composite" in pipeline.results
 
-    def test_calculate_metrics_msi(self):
-        """Test metric calculation for MSI"""
-        # Create pipeline with MSI config
-        config = {"metrics": ["MSI"]}
+    def test_calculate_metrics_single_map_pass(self):
+        """Test that all metrics and the date band are added in one map pass"""
+        pipeline = Pipeline({"metrics": ["EVI", "LAI", "MSI"]})
+        data = MockEEImageCollection()
+
+        with mock.patch.object(data, "map", wraps=data.map) as mock_map:
+            # Call the method
+            pipeline._calculate_metrics(data)
+
+            # Verify the collection is mapped exactly once
+            mock_map.assert_called_once()
+
+            # Verify the mapped function computes the metrics and adds the date
+            image = MockEEImage()
+            mock_map.call_args.args[0](image)
+            mock_combined.calculate_metrics.assert_called_with(
+                image,
+                ["EVI", "LAI", "MSI"],
+            )
+            mock_preprocessing.add_date.assert_called_with(
+                mock_combined.calculate_metrics.return_value,
+            )
+
+    def test_calculate_metrics_reprojects_to_target_grid(self):
+        """Test that images are reprojected in the map pass when configured"""
+        config = {
+            "metrics": ["EVI"],
+            "processing": {"target_crs": "EPSG:32635", "target_scale": 20},
+        }
         pipeline = Pipeline(config)
+        data = MockEEImageCollection()
 
-        # Create test data
+        with mock.patch.object(data, "map", wraps=data.map) as mock_map:
+            pipeline._calculate_metrics(data)
+
+            # Verify the mapped function reprojects before calculating metrics
+            image = mock.MagicMock()
+            mock_map.call_args.args[0](image)
+            image.reproject.assert_called_once_with(crs="EPSG:32635", scale=20)
+            mock_combined.calculate_metrics.assert_called_with(
+                image.reproject.return_value,
+                ["EVI"],
+            )
+
+    def test_calculate_metrics_selects_required_bands(self):
+        """Test that only the metrics' input bands are kept before mapping"""
+        pipeline = Pipeline({"metrics": ["MSI"]})
         data = MockEEImageCollection()
 
-        # Call the method
-        result = pipeline._calculate_metrics(data)
+        with mock.patch.object(data, "select", wraps=data.select) as mock_select:
+            # Call the method
+            pipeline._calculate_metrics(data)
+
+            # Verify the collection was narrowed to the required bands
+            mock_combined.get_required_bands.assert_called_with(["MSI"])
+            mock_select.assert_called_once_with(
+                mock_combined.get_required_bands.return_value,
+            )
+
+    @pytest.mark.parametrize("method", ["median", "mean", "mosaic"])
+    def test_create_composite(self, method):
+        """Test the configured composite method is used"""
+        pipeline = Pipeline({"processing": {"composite_method": method}})
+        data = MockEEImageCollection()
 
-        # Verify the result
+        with mock.patch.object(data, method, wraps=getattr(data, method)) as reducer:
+            result = pipeline._create_composite(data)
+
+        reducer.assert_called_once_with()
         assert isinstance(result, MockEEImage)
 
+    def test_create_composite_invalid_method(self):
+        """Test an unknown composite method raises an error"""
+        pipeline = Pipeline({"processing": {"composite_method": "medoid"}})
+
+        with pytest.raises(ValueError, match="Unsupported composite method"):
+            pipeline._create_composite(MockEEImageCollection())
+
     def test_prepare_file_info(self):
         """Test file info preparation"""
         # Create pipeline with config and ensure start_date is an ee.Date
         config = {
             "area": "finland",
-            "start_date": mock_ee.Date("2023-01-01"),
+            "start_date": START_DATE,
             "output": {"prefix": "test_"},
         }
         pipeline = Pipeline(config)
@@ -263,6 +424,22 @@ class TestPipeline:
         assert result["area_name"] == "finland"
         assert result["filename_base"] == "test_finland_20230101"
 
+    def test_prepare_file_info_string_date(self):
+        """Test file info preparation from a YAML string start date"""
+        config = {
+            "area": "finland",
+            "start_date": "2023-01-01",
+            "output": {"prefix": "test_"},
+        }
+        pipeline = Pipeline(config)
+
+        # Call the method
+        result = pipeline._prepare_file_info()
+
+        # Verify the date is used as-is for naming
+        assert result["start_date"] == "2023-01-01"
+        assert result["filename_base"] == "test_finland_20230101"
+
     def test_get_export_region(self):
         """Test export region retrieval"""
         # Create pipeline
@@ -274,11 +451,25 @@ class TestPipeline:
         # Verify the coordinates were returned
         assert isinstance(result, list)
 
+    def test_region_is_cached(self):
+        """Test the export region is looked up once per pipeline"""
+        pipeline = Pipeline({"area": "finland"})
+
+        with mock.patch.object(
+            pipeline,
+            "_get_export_region",
+            wraps=pipeline._get_export_region,
+        ) as mock_region:
+            first = pipeline._region
+            second = pipeline._region
+
+        assert first is second
+        mock_region.assert_called_once_with("finland")
+
     def test_save_metric_geotiff(
         self,
         mock_httpx_module,
         mock_file_ops,
-        mock_tqdm_module,
     ):
         """Test saving GeoTIFF file for a metric"""
         # Create pipeline with mocked logger
@@ -297,7 +488,7 @@ class TestPipeline:
             # Set up test data
             metric = "EVI"
             image = MockEEImage({"EVI": 0.5})
-            output_path = Path("test_output")
+            output_path = OUTPUT_PATH
             file_info = {
                 "filename_base": "test_finland_20230101",
                 "area_name": "finland",
@@ -320,13 +511,437 @@ class TestPipeline:
             # Verify the download was initiated
             mock_httpx_module.stream.assert_called_once()
 
+    def test_save_metric_geotiff_cloud_optimized(self):
+        """Test that downloads are rewritten as COGs when configured"""
+        # Create pipeline with cloud-optimized output enabled
+        pipeline = Pipeline({"output": {"cloud_optimized": True}})
+        pipeline.logger = mock.MagicMock()
+
+        with (
+            mock.patch.object(pipeline, "_download_file_with_progress"),
+            mock.patch.object(pipeline, "_convert_to_cog") as mock_convert,
+        ):
+            # Call the method
+            result = pipeline._save_metric_geotiff(
+                "EVI",
+                MockEEImage({"EVI": 0.5}),
+                OUTPUT_PATH,
+                {"filename_base": "test_finland_20230101"},
+                [],
+            )
+
+            # Verify the downloaded file was converted in place
+            mock_convert.assert_called_once_with(result)
+
+    def test_save_multiband_geotiff(self, tmp_path):
+        """Test that a multi-band download is split into per-metric files"""
+        pipeline = Pipeline({"output": {"multiband": True}})
+        pipeline.logger = mock.MagicMock()
+        metrics = ["EVI", "LAI", "MSI"]
+        bands = np.arange(3 * 4 * 4, dtype="float32").reshape(3, 4, 4)
+
+        with mock.patch.object(
+            pipeline,
+            "_download_file_with_progress",
+            side_effect=lambda url, output_file, desc: write_bands(output_file, bands),
+        ):
+            # Call the method
+            result = pipeline._save_multiband_geotiff(
+                metrics,
+                MockEEImage({"EVI": 0.5, "LAI": 2.5, "MSI": 0.9}),
+                tmp_path,
+                {"filename_base": "test_finland_20230101"},
+                [],
+            )
+
+        # Verify each band was written to its own file in metric order
+        for band_index, metric in enumerate(metrics):
+            with rasterio.open(result[metric]) as src:
+                assert src.count == 1
+                assert src.descriptions == (metric,)
+                np.testing.assert_array_equal(src.read(1), bands[band_index])
+
+        # Verify the combined download was removed
+        assert not (tmp_path / "test_finland_20230101_all.tif").exists()
+
+    def test_save_multiband_geotiff_band_failure(self, tmp_path):
+        """Test that a failing band does not lose the other bands"""
+        pipeline = Pipeline({"output": {"multiband": True, "cloud_optimized": True}})
+        pipeline.logger = mock.MagicMock()
+        metrics = ["EVI", "LAI", "MSI"]
+        bands = np.zeros((3, 4, 4), dtype="float32")
+
+        with (
+            mock.patch.object(
+                pipeline,
+                "_download_file_with_progress",
+                side_effect=lambda url, output_file, desc: write_bands(
+                    output_file,
+                    bands,
+                ),
+            ),
+            # The conversion of the second band fails
+            mock.patch.object(
+                pipeline,
+                "_convert_to_cog",
+                side_effect=[None, RuntimeError("conversion failed"), None],
+            ),
+        ):
+            result = pipeline._save_multiband_geotiff(
+                metrics,
+                MockEEImage({"EVI": 0.5, "LAI": 2.5, "MSI": 0.9}),
+                tmp_path,
+                {"filename_base": "test_finland_20230101"},
+                [],
+            )
+
+        # Verify the other bands are saved and the failed one removed
+        assert result == {
+            "EVI": tmp_path / "test_finland_20230101_EVI.tif",
+            "LAI": None,
+            "MSI": tmp_path / "test_finland_20230101_MSI.tif",
+        }
+        assert result["EVI"].exists()
+        assert result["MSI"].exists()
+        assert not (tmp_path / "test_finland_20230101_LAI.tif").exists()
+        assert not (tmp_path / "test_finland_20230101_all.tif").exists()
+
+    def test_save_results(self, mock_file_ops):
+        """Test that metrics are saved concurrently and collected in order"""
+        # Create pipeline with a metric that is missing from the image
+        config = {
+            "area": "finland",
+            "metrics": ["MSI", "EVI", "NDVI"],
+            "output": {"multiband": False},
+        }
+        pipeline = Pipeline(config)
+        pipeline.logger = mock.MagicMock()
+
+        def mock_save(metric, image, output_path, file_info, region):
+            return output_path / f"{file_info['filename_base']}_{metric}.tif"
+
+        with (
+            mock.patch.object(
+                pipeline,
+                "_save_metric_geotiff",
+                side_effect=mock_save,
+            ) as mock_save_metric,
+            mock.patch.object(pipeline, "_save_metadata") as mock_save_metadata,
+        ):
+            image = MockEEImage({"EVI": 0.5, "MSI": 0.9})
+
+            # Call the method
+            result = pipeline._save_results(image)
+
+            # Verify only the available metrics were saved, in configured order
+            assert list(result) == ["MSI", "EVI"]
+            assert mock_save_metric.call_count == 2
+            saved_file_names = mock_save_metadata.call_args.args[3]
+            assert [name.rsplit("_", 1)[-1] for name in saved_file_names] == [
+                "MSI.tif",
+                "EVI.tif",
+            ]
+            pipeline.logger.warning.assert_called_once()
+
+    def test_save_results_single_band_names_call(self, mock_file_ops):
+        """Test that band names are fetched once regardless of metric count"""
+        config = {"area": "finland", "metrics": ["EVI", "LAI", "MSI"]}
+        pipeline = Pipeline(config)
+        pipeline.logger = mock.MagicMock()
+        image = MockEEImage({"EVI": 0.5, "LAI": 2.5, "MSI": 0.9})
+
+        with (
+            mock.patch.object(
+                image,
+                "bandNames",
+                wraps=image.bandNames,
+            ) as mock_band_names,
+            mock.patch.object(pipeline, "_save_metric_geotiff"),
+            mock.patch.object(pipeline, "_save_metadata"),
+        ):
+            # Call the method
+            pipeline._save_results(image)
+
+            # Verify a single server round-trip for the band names
+            mock_band_names.assert_called_once()
+
+    def test_save_results_batches_server_values(self, mock_file_ops):
+        """Test that band names, bounds and start date share one round-trip"""
+        config = {
+            "area": "finland",
+            "metrics": ["EVI"],
+            "start_date": START_DATE,
+            "output": {"prefix": "test_", "multiband": False},
+        }
+        pipeline = Pipeline(config)
+        pipeline.logger = mock.MagicMock()
+        mock_ee.List.reset_mock()
+
+        with (
+            mock.patch.object(pipeline, "_get_export_region") as mock_region,
+            mock.patch.object(pipeline, "_save_metric_geotiff") as mock_save_metric,
+            mock.patch.object(pipeline, "_save_metadata"),
+        ):
+            # Call the method without known band names
+            pipeline._save_results(MockEEImage({"EVI": 0.5}))
+
+            # Verify the three values were fetched with one batched request
+            mock_ee.List.assert_called_once()
+            assert len(mock_ee.List.call_args.args[0]) == 3
+            mock_region.assert_not_called()
+
+            # Verify the fetched values were used for the export
+            assert pipeline.start_date == "2023-01-01"
+            kwargs = mock_save_metric.call_args.kwargs
+            assert kwargs["file_info"]["filename_base"] == "test_finland_20230101"
+            assert kwargs["region"] == [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]
+
+    def test_save_results_known_band_names(self, mock_file_ops):
+        """Test that known band names skip the server round-trip"""
+        config = {
+            "area": "finland",
+            "metrics": ["EVI", "MSI"],
+            "output": {"multiband": False},
+        }
+        pipeline = Pipeline(config)
+        pipeline.logger = mock.MagicMock()
+        image = MockEEImage({"EVI": 0.5, "MSI": 0.9})
+
+        with (
+            mock.patch.object(image, "bandNames") as mock_band_names,
+            mock.patch.object(pipeline, "_save_metric_geotiff") as mock_save_metric,
+            mock.patch.object(pipeline, "_save_metadata"),
+        ):
+            # Call the method with the bands derived from the config
+            result = pipeline._save_results(image, pipeline._metric_bands)
+
+            # Verify the metrics were saved without asking for the band names
+            assert list(result) == ["EVI", "MSI"]
+            assert mock_save_metric.call_count == 2
+            mock_band_names.assert_not_called()
+
+    def test_save_results_gcs_export(self, mock_file_ops):
+        """Test that metrics are exported to Cloud Storage in gcs mode"""
+        # Create pipeline configured for batch export
+        config = {
+            "area": "finland",
+            "metrics": ["EVI", "LAI"],
+            "output": {"prefix": "test_"},
+            "export": {"mode": "gcs", "bucket": "test-bucket", "poll_interval": 0},
+        }
+        pipeline = Pipeline(config)
+        pipeline.logger = mock.MagicMock()
+
+        # The EVI export completes after one poll, the LAI export fails
+        evi_task = mock.MagicMock()
+        evi_task.status.side_effect = [{"state": "RUNNING"}, {"state": "COMPLETED"}]
+        lai_task = mock.MagicMock()
+        lai_task.status.return_value = {"state": "FAILED", "error_message": "boom"}
+
+        mock_batch = mock.MagicMock()
+        mock_batch.Export.image.toCloudStorage.side_effect = [evi_task, lai_task]
+
+        with (
+            mock.patch.object(mock_ee, "batch", mock_batch, create=True),
+            mock.patch.object(pipeline, "_prepare_file_info") as mock_file_info,
+            mock.patch.object(pipeline, "_save_metadata"),
+            mock.patch.object(pipeline, "_save_metric_geotiff") as mock_download,
+            mock.patch.object(runner.time, "sleep"),
+        ):
+            mock_file_info.return_value = {
+                "area_name": "finland",
+                "start_date": "2023-01-01",
+                "filename_base": "test_finland_20230101",
+            }
+            image = MockEEImage({"EVI": 0.5, "LAI": 2.5})
+
+            # Call the method
+            result = pipeline._save_results(image)
+
+            # Verify both tasks were started and only EVI was saved
+            evi_task.start.assert_called_once()
+            lai_task.start.assert_called_once()
+            assert pipeline.results["export_tasks"] == {
+                "EVI": evi_task,
+                "LAI": lai_task,
+            }
+            assert result == {
+                "EVI": Path("/vsigs/test-bucket/test_finland_20230101_EVI.tif"),
+            }
+            mock_download.assert_not_called()
+
+            # Verify the export requested a cloud-optimized GeoTIFF
+            export_kwargs = mock_batch.Export.image.toCloudStorage.call_args.kwargs
+            assert export_kwargs["bucket"] == "test-bucket"
+            assert export_kwargs["formatOptions"] == {"cloudOptimized": True}
+            assert export_kwargs["fileDimensions"] == [32768, 32768]
+            assert export_kwargs["crs"] == "EPSG:4326"
+            assert export_kwargs["scale"] == 100
+
+    def test_download_params_default_grid(self):
+        """Test that downloads without a native grid are limited in size"""
+        pipeline = Pipeline({"metrics": ["EVI"]})
+
+        params = pipeline._download_params([])
+
+        assert params["crs"] == "EPSG:4326"
+        assert params["dimensions"] == 1024
+        assert "crs_transform" not in params
+
+    def test_native_projection_params(self):
+        """Test that a configured native grid is used for downloads and exports"""
+        crs_transform = [10, 0, 500000, 0, -10, 7000000]
+        config = {
+            "metrics": ["EVI"],
+            "export": {
+                "bucket": "test-bucket",
+                "crs": "EPSG:32635",
+                "crs_transform": crs_transform,
+                "poll_interval": 0,
+            },
+        }
+        pipeline = Pipeline(config)
+        pipeline.logger = mock.MagicMock()
+
+        # Verify the download uses the native projection
+        params = pipeline._download_params([])
+        assert params["crs"] == "EPSG:32635"
+        assert params["crs_transform"] == crs_transform
+        assert "dimensions" not in params
+
+        task = mock.MagicMock()
+        task.status.return_value = {"state": "COMPLETED"}
+        mock_batch = mock.MagicMock()
+        mock_batch.Export.image.toCloudStorage.return_value = task
+        with mock.patch.object(mock_ee, "batch", mock_batch, create=True):
+            pipeline._export_metrics_to_gcs(
+                ["EVI"],
+                MockEEImage({"EVI": 0.5}),
+                {"filename_base": "test_finland_20230101"},
+                [],
+            )
+
+        # Verify the export uses the native grid instead of a scale
+        export_kwargs = mock_batch.Export.image.toCloudStorage.call_args.kwargs
+        assert export_kwargs["crs"] == "EPSG:32635"
+        assert export_kwargs["crsTransform"] == crs_transform
+        assert "scale" not in export_kwargs
+
+    def test_materialize_composite_to_asset(self):
+        """Test that the composite is stored as an asset and read back"""
+        config = {
+            "export": {"asset_root": "projects/test/assets/rs/", "poll_interval": 0},
+        }
+        pipeline = Pipeline(config)
+        pipeline.logger = mock.MagicMock()
+        image = MockEEImage({"EVI": 0.5})
+
+        task = mock.MagicMock()
+        task.status.return_value = {"state": "COMPLETED"}
+        mock_batch = mock.MagicMock()
+        mock_batch.Export.image.toAsset.return_value = task
+        mock_ee.Image.reset_mock()
+
+        with mock.patch.object(mock_ee, "batch", mock_batch, create=True):
+            result = pipeline._materialize_composite(
+                image,
+                {"filename_base": "test_finland_20230101"},
+                [],
+            )
+
+        # Verify the export and that the stored asset is used from then on
+        asset_id = "projects/test/assets/rs/test_finland_20230101"
+        export_kwargs = mock_batch.Export.image.toAsset.call_args.kwargs
+        assert export_kwargs["image"] is image
+        assert export_kwargs["assetId"] == asset_id
+        assert export_kwargs["overwrite"] is True
+        task.start.assert_called_once()
+        mock_ee.Image.assert_called_once_with(asset_id)
+        assert isinstance(result, MockEEImage)
+
+    def test_materialize_composite_fallback(self):
+        """Test that a failed asset export falls back to the computed image"""
+        pipeline = Pipeline(
+            {"export": {"asset_root": "users/test", "poll_interval": 0}},
+        )
+        pipeline.logger = mock.MagicMock()
+        image = MockEEImage({"EVI": 0.5})
+
+        task = mock.MagicMock()
+        task.status.return_value = {"state": "FAILED", "error_message": "boom"}
+        mock_batch = mock.MagicMock()
+        mock_batch.Export.image.toAsset.return_value = task
+
+        with mock.patch.object(mock_ee, "batch", mock_batch, create=True):
+            result = pipeline._materialize_composite(
+                image,
+                {"filename_base": "test_finland_20230101"},
+                [],
+            )
+
+        assert result is image
+        pipeline.logger.warning.assert_called_once()
+
+    def test_materialize_composite_disabled(self):
+        """Test that no asset is written without an asset root"""
+        pipeline = Pipeline({})
+        image = MockEEImage({"EVI": 0.5})
+
+        assert pipeline._materialize_composite(image, {}, []) is image
+
+    def test_export_requests_share_executor(self):
+        """Test that export requests reuse one module-level thread pool"""
+        executor = _get_executor()
+
+        assert _get_executor() is executor
+        assert executor._thread_name_prefix == "ee-io"
+
+    def test_save_results_gcs_export_requires_bucket(self, mock_file_ops):
+        """Test that gcs mode fails clearly without a bucket"""
+        pipeline = Pipeline({"metrics": ["EVI"], "export": {"mode": "gcs"}})
+        pipeline.logger = mock.MagicMock()
+
+        with mock.patch.object(pipeline, "_prepare_file_info") as mock_file_info:
+            mock_file_info.return_value = {
+                "area_name": "finland",
+                "start_date": "2023-01-01",
+                "filename_base": "test_finland_20230101",
+            }
+
+            with pytest.raises(ValueError, match="export.bucket"):
+                pipeline._save_results(MockEEImage({"EVI": 0.5}))
+
+    def test_download_file_with_progress(
+        self,
+        mock_httpx_module,
+        mock_tqdm_module,
+        tmp_path,
+    ):
+        """Test downloading a file through the shared HTTP client"""
+        pipeline = Pipeline({})
+        output_file = tmp_path / "test_EVI.tif"
+
+        # Call the method
+        pipeline._download_file_with_progress(
+            "https://example.com/download/EVI",
+            output_file,
+            "Downloading EVI",
+        )
+
+        # Verify the shared client streamed the file to disk
+        mock_httpx_module.stream.assert_called_once_with(
+            "GET",
+            "https://example.com/download/EVI",
+        )
+        assert output_file.read_bytes() == b"test data"
+
     def test_save_metadata(self, mock_file_ops):
         """Test saving metadata"""
         # Create pipeline
         pipeline = Pipeline({})
 
         # Set up test data
-        output_path = Path("test_output")
+        output_path = OUTPUT_PATH
         file_info = {
             "area_name": "finland",
             "start_date": "2023-01-01",
@@ -343,6 +958,25 @@ class TestPipeline:
         assert pipeline.results["metadata"]["area"] == "finland"
         assert pipeline.results["metadata"]["metrics"] == ["EVI", "LAI"]
 
+    def test_save_metadata_writes_file(self, tmp_path):
+        """Test that metadata is written atomically as JSON"""
+        pipeline = Pipeline({"end_date": "2023-01-31"})
+        file_info = {
+            "area_name": "finland",
+            "start_date": "2023-01-01",
+            "filename_base": "test_finland_20230101",
+        }
+
+        # Call the method
+        pipeline._save_metadata(tmp_path, file_info, ["EVI"], ["test_EVI.tif"])
+
+        # Verify the metadata file exists and no temporary file is left behind
+        metadata_file = tmp_path / "test_finland_20230101_metadata.json"
+        metadata = json.loads(metadata_file.read_text())
+        assert metadata["end_date"] == "2023-01-31"
+        assert metadata["files_saved"] == ["test_EVI.tif"]
+        assert list(tmp_path.iterdir()) == [metadata_file]
+
     def test_generate_statistics(self):
         """Test statistics generation"""
         # Create pipeline with statistics enabled
@@ -352,8 +986,8 @@ class TestPipeline:
 
         # Set up test data
         saved_files = {
-            "EVI": Path("test_output/test_finland_20230101_EVI.tif"),
-            "LAI": Path("test_output/test_finland_20230101_LAI.tif"),
+            "EVI": EVI_TIF,
+            "LAI": LAI_TIF,
         }
 
         # Call the method
@@ -365,7 +999,10 @@ class TestPipeline:
 
         # Verify results were stored
         assert "index_statistics" in pipeline.results
-        assert "index_comparison" in pipeline.results
+        assert pipeline.results["index_comparison"] == {
+            "mean": {"EVI": 0.5, "LAI": 2.5},
+            "median": {"EVI": 0.4, "LAI": 2.3},
+        }
 
     def test_run_full_pipeline(self, mock_httpx_module, mock_file_ops):
         """Test the full pipeline execution"""
@@ -373,7 +1010,7 @@ class TestPipeline:
         config = {
             "area": "finland",
             "metrics": ["EVI", "LAI"],
-            "start_date": mock_ee.Date("2023-01-01"),
+            "start_date": START_DATE,
         }
         pipeline = Pipeline(config)
         pipeline.logger = mock.MagicMock()
@@ -388,17 +1025,19 @@ class TestPipeline:
             mock_extract.return_value = MockEEImageCollection()
             mock_calc.return_value = MockEEImage({"EVI": 0.5, "LAI": 2.5})
             mock_save.return_value = {
-                "EVI": Path("test_output/test_finland_20230101_EVI.tif"),
-                "LAI": Path("test_output/test_finland_20230101_LAI.tif"),
+                "EVI": EVI_TIF,
+                "LAI": LAI_TIF,
             }
 
             # Run the pipeline
             _ = pipeline.run()
 
-            # Verify Earth Engine was initialized
-            assert mock_ee.Initialize.called
+            # Verify Earth Engine was initialized on the high-volume endpoint
+            mock_ee.Initialize.assert_called_with(
+                url="https://earthengine-highvolume.googleapis.com",
+            )
 
             # Verify each step was called
             mock_extract.assert_called_once()
             mock_calc.assert_called_once()
-            mock_save.assert_called_once()
+            mock_save.assert_called_once_with(mock_calc.return_value, ["EVI", "LAI"])
@@ -1,18 +1,9 @@
+import importlib
 import sys
+from datetime import UTC, datetime
 from unittest import mock
 
-
-class MockDate:
-    def __init__(self, date_millis):
-        self.date_millis = date_millis
-
-    def format(self, format_str: str) -> str:
-        """Mock the format method for a specific test case."""
-        if (
-            format_str == "YYYYMMdd" and self.date_millis == 1617235200000
-        ):  # April 1, 2021
-            return "20210401"
-        return "00000000"
+import pytest
 
 
 class MockImage:
@@ -46,51 +37,60 @@ class MockImage:
         return self.date_millis
 
 
-# Create a proper mock for the ee module
-mock_ee = mock.Mock()
+class MockNumber:
+    def __init__(self, value):
+        self.value = value
+
+    def _value_of(self, other):
+        return other.value if isinstance(other, MockNumber) else other
 
-# Configure mock for ee.Date
-mock_date = MockDate(1617235200000)
-mock_ee.Date = mock.Mock(return_value=mock_date)
+    def add(self, other):
+        return MockNumber(self.value + self._value_of(other))
 
-# Configure mock for ee.Number.parse to return a value
-mock_ee.Number.parse = mock.Mock(return_value=20210401)
+    def multiply(self, other):
+        return MockNumber(self.value * self._value_of(other))
 
-# Configure mock for ee.Image to return a MockImage with the value in an unnamed band
-mock_ee.Image = mock.Mock(side_effect=lambda x: MockImage({"unnamed": x}))
 
+class MockComponentDate:
+    """Mock ee.Date exposing calendar components as numbers."""
 
-# Create a patched version of add_date that uses our mocks instead of actual ee module
-def patched_add_date(image):
-    # Create a date band with value 20210401
-    date_band = MockImage({"date": 20210401}, image.date_millis)
-    # Add the date band to the original image
-    return image.addBands(date_band)
+    def __init__(self, date_millis):
+        self.date = datetime.fromtimestamp(date_millis / 1000, tz=UTC)
+
+    def get(self, unit):
+        return MockNumber(getattr(self.date, unit))
 
 
-# Apply the mock to the ee module
-with mock.patch.dict("sys.modules", {"ee": mock_ee}):
-    # Create a mock for the whole module
-    mock_preprocessing_module = mock.Mock()
-    # Set the mock for add_date to our patched version
-    mock_preprocessing_module.add_date = patched_add_date
-    # Explicitly type the module with type ignore comment
-    sys.modules["src.processors.preprocessing"] = mock_preprocessing_module  # type: ignore
+class MockDatedImage(MockImage):
+    """Mock image whose date() returns an ee.Date like the real API."""
+
+    def date(self):
+        return MockComponentDate(self.date_millis)
+
+
+@pytest.fixture(scope="module")
+def preprocessing():
+    """Import the real preprocessing module once against an arithmetic ee mock."""
+    arithmetic_ee = mock.Mock()
+    arithmetic_ee.Image.constant = lambda x: MockImage({"unnamed": x.value})
+
+    with mock.patch.dict(sys.modules, {"ee": arithmetic_ee}):
+        sys.modules.pop("src.processors.preprocessing", None)
+        yield importlib.import_module("src.processors.preprocessing")
 
 
 class TestPreprocessing:
     """Tests for the preprocessing module."""
 
-    def test_add_date(self):
+    def test_add_date(self, preprocessing):
         """Test adding date band to an image."""
         # Create a mock image with a specific date (April 1, 2021)
-        mock_image = MockImage(
+        mock_image = MockDatedImage(
             {"B2": 1000, "B4": 2000, "B8": 5000},
             date_millis=1617235200000,
         )  # April 1, 2021 in milliseconds
 
-        # Call the patched function
-        result = patched_add_date(mock_image)
+        result = preprocessing.add_date(mock_image)
 
         # Check that the result is a MockImage
         assert isinstance(result, MockImage)
@@ -103,16 +103,25 @@ class TestPreprocessing:
         assert "B4" in result.bands
         assert "B8" in result.bands
 
-    def test_date_formatting(self):
+    def test_date_formatting(self, preprocessing):
         """Test that the date is correctly formatted as YYYYMMDD."""
         # Create a mock image with a specific date
-        mock_image = MockImage({}, date_millis=1617235200000)  # April 1, 2021
+        mock_image = MockDatedImage({}, date_millis=1617235200000)  # April 1, 2021
 
-        # Call the patched function
-        result = patched_add_date(mock_image)
+        result = preprocessing.add_date(mock_image)
 
         # Verify that the date band was added
         assert "date" in result.bands
 
         # Verify the date value is correct (20210401)
         assert result.bands["date"] == 20210401
+
+    def test_add_date_encodes_components(self, preprocessing):
+        """Test that the real add_date builds YYYYMMDD from date components."""
+        mock_image = MockDatedImage({"B2": 1000}, date_millis=1617235200000)
+
+        result = preprocessing.add_date(mock_image)
+
+        assert result.bands["date"] == 20210401
+        assert result.bands["B2"] == 1000
+        preprocessing.ee.Date.assert_not_called()
@@ -0,0 +1 @@
+# Scripts tests package initialization
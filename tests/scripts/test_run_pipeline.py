@@ -0,0 +1,38 @@
+import importlib.util
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).parents[2] / "scripts" / "run_pipeline.py"
+
+# The script is not part of a package, so load it from its path. Typer is
+# only needed to build the CLI, so mock it while the script is executed
+spec = importlib.util.spec_from_file_location("run_pipeline", SCRIPT_PATH)
+assert spec is not None and spec.loader is not None
+run_pipeline = importlib.util.module_from_spec(spec)
+with mock.patch.dict(sys.modules, {"typer": mock.MagicMock()}):
+    spec.loader.exec_module(run_pipeline)
+
+
+@pytest.mark.parametrize(
+    ("filename", "metric"),
+    [
+        # Files written by the pipeline are identified by their suffix
+        ("rs_metrics_finland_20240401_EVI.tif", "EVI"),
+        ("rs_metrics_laitila_20240401_MSI.tif", "MSI"),
+        # Other filenames may name the metric anywhere
+        ("EVI.tif", "EVI"),
+        ("LAI_2024.tif", "LAI"),
+        ("summer_EVI.tiff", "EVI"),
+        ("area_MSI_clip.tif", "MSI"),
+        # Without the pipeline suffix, the first metric of METRICS wins
+        ("MSI_vs_EVI.tif", "EVI"),
+        ("evi.tif", None),
+        ("elevation.tif", None),
+    ],
+)
+def test_metric_from_filename(filename, metric):
+    """Test that metrics are identified from pipeline and other filenames"""
+    assert run_pipeline.metric_from_filename(filename) == metric
@@ -1,3 +1,8 @@
+import csv
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
 
 import numpy as np
@@ -8,18 +13,24 @@ import pytest
 # Create proper implementations for the functions we need to mock
 def mock_calculate_basic_stats(data):
     """Mock implementation of calculate_basic_stats"""
+    # One partition yields the range, quartiles and median
+    data_min, percentile_25, median, percentile_75, data_max = np.quantile(
+        data,
+        [0, 0.25, 0.5, 0.75, 1],
+    )
+    var = np.var(data)
     return {
         "count": len(data),
         "mean": np.mean(data),
-        "median": np.median(data),
-        "std": np.std(data),
-        "var": np.var(data),
-        "min": np.min(data),
-        "max": np.max(data),
-        "range": np.max(data) - np.min(data),
-        "percentile_25": np.percentile(data, 25),
-        "percentile_75": np.percentile(data, 75),
-        "iqr": np.percentile(data, 75) - np.percentile(data, 25),
+        "median": median,
+        "std": np.sqrt(var),
+        "var": var,
+        "min": data_min,
+        "max": data_max,
+        "range": data_max - data_min,
+        "percentile_25": percentile_25,
+        "percentile_75": percentile_75,
+        "iqr": percentile_75 - percentile_25,
         "skewness": 0.1,  # Mock value
         "kurtosis": -0.2,  # Mock value
     }
@@ -30,8 +41,9 @@ def mock_sample_data_func(data, max_sample=5000):
     if len(data) <= max_sample:
         return data
     else:
-        # Simple random sampling
-        indices = np.random.choice(len(data), max_sample, replace=False)
+        # Sample without permuting the whole array, as sample_data does
+        rng = np.random.default_rng()
+        indices = rng.choice(len(data), max_sample, replace=False, shuffle=False)
         return data[indices]
 
 
@@ -70,25 +82,32 @@ with mock.patch.dict(
     {
         "matplotlib": mock.MagicMock(),
         "matplotlib.pyplot": mock.MagicMock(),
-        "seaborn": mock.MagicMock(),
         "rasterio": mock.MagicMock(),
         "scipy": mock.MagicMock(),
         "scipy.stats": mock.MagicMock(),
     },
 ):
-    # Now import the distribution module with mocked dependencies
+    # Now import the distribution module with mocked dependencies, replacing
+    # any stand-in registered by other test modules
+    sys.modules.pop("src.statistics.distribution", None)
     from src.statistics.distribution import (
+        GeospatialVisualizer,
         NormalityTester,
         StatisticsCalculator,
         VegetationIndexAnalyzer,
     )
 
+    distribution = sys.modules["src.statistics.distribution"]
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def sample_data():
-    """Create sample data for testing"""
-    np.random.seed(42)  # Set seed for reproducibility
-    return np.random.normal(5, 2, 1000)  # Normal distribution with mean=5, std=2
+    """Create sample data for testing, shared read-only by the whole module"""
+    # Seeded generator for reproducibility, leaving the global RandomState alone
+    rng = np.random.default_rng(42)
+    data = rng.normal(5, 2, 1000)  # Normal distribution with mean=5, std=2
+    data.flags.writeable = False
+    return data
 
 
 class TestStatisticsCalculator:
@@ -129,6 +148,142 @@ class TestStatisticsCalculator:
             assert abs(stats["mean"] - np.mean(sample_data)) < 1e-10
             assert abs(stats["median"] - np.median(sample_data)) < 1e-10
 
+    def test_calculate_basic_stats_keys_and_types(self, sample_data):
+        """Test that the statistics come in STAT_NAMES order as plain numbers"""
+        stats = StatisticsCalculator.calculate_basic_stats(sample_data)
+        assert tuple(stats) == StatisticsCalculator.STAT_NAMES
+
+        # Everything but the count is a plain float, ready for CSV and JSON
+        non_floats = {
+            key: type(value).__name__
+            for key, value in stats.items()
+            if key != "count" and not isinstance(value, float)
+        }
+        assert not non_floats, f"non-float statistics: {non_floats}"
+        assert isinstance(stats["count"], int)
+
+    def test_calculate_basic_stats_values(self, sample_data):
+        """Test that the shared reductions match the individual NumPy ones"""
+        stats = StatisticsCalculator.calculate_basic_stats(sample_data)
+
+        assert stats["count"] == len(sample_data)
+        assert stats["mean"] == pytest.approx(np.mean(sample_data))
+        assert stats["median"] == pytest.approx(np.median(sample_data))
+        assert stats["std"] == pytest.approx(np.std(sample_data))
+        assert stats["var"] == pytest.approx(np.var(sample_data))
+        assert stats["range"] == pytest.approx(np.ptp(sample_data))
+        percentile_25, percentile_75 = np.percentile(sample_data, [25, 75])
+        assert stats["percentile_25"] == pytest.approx(percentile_25)
+        assert stats["percentile_75"] == pytest.approx(percentile_75)
+        assert stats["iqr"] == pytest.approx(percentile_75 - percentile_25)
+
+        # Skewness and kurtosis use the biased moment estimators
+        deviations = sample_data - sample_data.mean()
+        assert stats["skewness"] == pytest.approx(
+            np.mean(deviations**3) / np.mean(deviations**2) ** 1.5,
+        )
+        assert stats["kurtosis"] == pytest.approx(
+            np.mean(deviations**4) / np.mean(deviations**2) ** 2 - 3,
+        )
+
+    def test_calculate_basic_stats_single_partition(self, sample_data):
+        """Test that the median and quartiles share one selection pass"""
+        with mock.patch.object(
+            distribution.np,
+            "percentile",
+            wraps=np.percentile,
+        ) as mock_percentile:
+            StatisticsCalculator.calculate_basic_stats(sample_data)
+
+        mock_percentile.assert_called_once()
+        assert list(mock_percentile.call_args.args[1]) == [25, 50, 75]
+
+    @staticmethod
+    def _mock_raster(data, nodata):
+        """Patch rasterio.open to serve a band as rasterio's masked read would"""
+        src = mock.MagicMock()
+        src.read.return_value = np.ma.masked_equal(data, nodata)
+        src.nodata = nodata
+        src.meta = {"nodata": nodata}
+        return mock.patch.object(
+            distribution.rasterio,
+            "open",
+            return_value=mock.MagicMock(__enter__=mock.Mock(return_value=src)),
+        )
+
+    def test_load_raster_data_filters_nodata(self):
+        """Test that nodata pixels are dropped from the valid data"""
+        data = np.array([[1.0, -9999.0], [3.0, 4.0]])
+
+        with self._mock_raster(data, -9999.0):
+            valid_data, nodata, meta = StatisticsCalculator.load_raster_data("a.tif")
+
+        np.testing.assert_array_equal(valid_data, [1.0, 3.0, 4.0])
+        assert nodata == -9999.0
+        assert meta == {"nodata": -9999.0}
+
+    def test_load_raster_data_without_nodata_pixels(self):
+        """Test that a fully valid band is returned as a view, not a copy"""
+        data = np.array([[1.0, 2.0], [3.0, 4.0]])
+
+        with self._mock_raster(data, -9999.0) as mock_open:
+            valid_data, _, _ = StatisticsCalculator.load_raster_data("a.tif")
+
+        band = mock_open.return_value.__enter__.return_value.read.return_value
+        np.testing.assert_array_equal(valid_data, [1.0, 2.0, 3.0, 4.0])
+        assert np.shares_memory(valid_data, band.data)
+
+    def test_load_raster_data_reads_into_buffer(self):
+        """Test that a preallocated buffer is passed through to rasterio"""
+        data = np.array([[1.0, 2.0], [3.0, 4.0]])
+        buffer = np.empty_like(data)
+
+        with self._mock_raster(data, -9999.0) as mock_open:
+            StatisticsCalculator.load_raster_data("a.tif", out=buffer)
+
+        src = mock_open.return_value.__enter__.return_value
+        src.read.assert_called_once_with(1, out=buffer, masked=True)
+
+    def test_stream_stats(self, sample_data):
+        """Test that block-wise statistics match the whole-array statistics"""
+        band = np.ma.masked_equal(
+            np.append(sample_data, [-9999.0] * 24).reshape(32, 32),
+            -9999.0,
+        )
+        windows = [(slice(0, 16), None), (slice(16, 32), None)]
+
+        src = mock.MagicMock(width=32, height=32)
+        src.block_windows.return_value = [((i, 0), w) for i, w in enumerate(windows)]
+        src.read.side_effect = lambda _, window, masked: band[window]
+
+        with mock.patch.object(
+            distribution.rasterio,
+            "open",
+            return_value=mock.MagicMock(__enter__=mock.Mock(return_value=src)),
+        ):
+            stats, sample = StatisticsCalculator.stream_stats("a.tif", sample_size=200)
+
+        deviations = sample_data - sample_data.mean()
+        tolerance = np.ptp(sample_data) / 4096
+
+        assert stats["count"] == len(sample_data)
+        assert stats["mean"] == pytest.approx(np.mean(sample_data))
+        assert stats["var"] == pytest.approx(np.var(sample_data))
+        assert stats["range"] == pytest.approx(np.ptp(sample_data))
+        assert stats["skewness"] == pytest.approx(
+            np.mean(deviations**3) / np.mean(deviations**2) ** 1.5,
+        )
+        assert stats["kurtosis"] == pytest.approx(
+            np.mean(deviations**4) / np.mean(deviations**2) ** 2 - 3,
+        )
+        for key, q in [("percentile_25", 25), ("median", 50), ("percentile_75", 75)]:
+            assert abs(stats[key] - np.percentile(sample_data, q)) < tolerance
+        assert all(type(value) in (int, float) for value in stats.values())
+
+        # The sample holds only valid values, kept at a rate of 200 in 1024
+        assert np.isin(sample, sample_data).all()
+        assert 100 < sample.size < 300
+
 
 class TestNormalityTester:
     """Tests for the NormalityTester class"""
@@ -145,12 +300,101 @@ class TestNormalityTester:
             small_data = np.array([1, 2, 3, 4, 5])
             sampled = NormalityTester.sample_data(small_data, max_sample=10)
             assert len(sampled) == 5  # Should keep all data
+            assert np.array_equal(np.sort(sampled), np.arange(1, 6))
 
             # Test with data larger than max_sample
-            big_data = np.random.normal(0, 1, 10000)
+            big_data = np.random.default_rng(42).normal(0, 1, 10000)
             sampled = NormalityTester.sample_data(big_data, max_sample=500)
             assert len(sampled) == 500  # Should sample down to max_sample
 
+    def test_sample_data_draws_distinct_values(self):
+        """Test that sampling draws distinct values without replacement"""
+        data = np.arange(100_000)
+
+        sampled = NormalityTester.sample_data(data, max_sample=5000)
+
+        assert len(sampled) == 5000
+        assert len(np.unique(sampled)) == 5000
+
+        # Small inputs are returned unchanged
+        small_data = np.array([1, 2, 3])
+        assert NormalityTester.sample_data(small_data, max_sample=10) is small_data
+
+    def test_run_all_tests_subsamples_shapiro(self, sample_data):
+        """Test that Shapiro-Wilk runs on a smaller subsample than the others"""
+        anderson_results = {
+            "anderson_statistic": 0.3,
+            "anderson_critical_value": 0.75,
+        }
+        with (
+            mock.patch.object(
+                distribution.stats,
+                "shapiro",
+                return_value=SimpleNamespace(statistic=0.98, pvalue=0.35),
+            ) as mock_shapiro,
+            mock.patch.object(
+                distribution.stats,
+                "normaltest",
+                return_value=SimpleNamespace(statistic=1.2, pvalue=0.55),
+            ) as mock_normaltest,
+            mock.patch.object(
+                NormalityTester,
+                "anderson_test",
+                return_value=anderson_results,
+            ) as mock_anderson,
+        ):
+            results = NormalityTester.run_all_tests(sample_data)
+
+        assert results == {
+            "shapiro_statistic": 0.98,
+            "shapiro_p_value": 0.35,
+            "dagostino_statistic": 1.2,
+            "dagostino_p_value": 0.55,
+            **anderson_results,
+        }
+        assert len(mock_shapiro.call_args.args[0]) == NormalityTester.SHAPIRO_MAX_SAMPLE
+        assert len(mock_normaltest.call_args.args[0]) == len(sample_data)
+
+        # Anderson-Darling gets the sample sorted once up front
+        sorted_sample = mock_anderson.call_args.args[0]
+        assert np.array_equal(sorted_sample, np.sort(sample_data))
+        assert mock_anderson.call_args.kwargs == {"assume_sorted": True}
+
+    @pytest.mark.parametrize(
+        ("method", "keys"),
+        [
+            ("shapiro_test", ("shapiro_statistic", "shapiro_p_value")),
+            ("dagostino_test", ("dagostino_statistic", "dagostino_p_value")),
+            ("anderson_test", ("anderson_statistic", "anderson_critical_value")),
+        ],
+    )
+    def test_normality_test_results(self, method, keys, sample_data, real_plotting):
+        """Test that each normality test reports its two values as floats"""
+        result = getattr(NormalityTester, method)(sample_data)
+
+        assert tuple(result) == keys
+        assert all(isinstance(value, float) for value in result.values())
+
+    # scipy.stats.anderson warns that its critical values are deprecated
+    @pytest.mark.filterwarnings("ignore::FutureWarning")
+    @pytest.mark.parametrize("assume_sorted", [False, True])
+    def test_anderson_test_matches_scipy(
+        self,
+        assume_sorted,
+        sample_data,
+        real_plotting,
+    ):
+        """Test that the Anderson-Darling statistic matches scipy's"""
+        expected = distribution.stats.anderson(sample_data)
+        data = np.sort(sample_data) if assume_sorted else sample_data
+
+        result = NormalityTester.anderson_test(data, assume_sorted=assume_sorted)
+
+        assert result["anderson_statistic"] == pytest.approx(expected.statistic)
+        assert result["anderson_critical_value"] == pytest.approx(
+            expected.critical_values[2],
+        )
+
     def test_interpret_normality(self):
         """Test normality interpretation with various test results"""
         # Use patch to mock the method during this test
@@ -183,6 +427,166 @@ class TestNormalityTester:
             assert is_normal is False
             assert len(reasons) >= 3  # Should have at least 3 reasons
 
+    def test_interpret_normality_reasons(self):
+        """Test that each failed check is reported with its values"""
+        stats_dict = {
+            "shapiro_p_value": 0.2,
+            "dagostino_p_value": 0.01,
+            "anderson_statistic": 0.8,
+            "anderson_critical_value": 0.7,
+        }
+
+        is_normal, reasons = NormalityTester.interpret_normality(stats_dict)
+
+        assert is_normal is False
+        assert reasons == [
+            "D'Agostino's test p-value: 0.010000 < 0.05",
+            "Anderson-Darling test: 0.8000 > 0.7000 (critical value)",
+        ]
+
+        # Skewness is only checked when present
+        stats_dict.update(dagostino_p_value=0.3, anderson_statistic=0.6)
+        assert NormalityTester.interpret_normality(stats_dict) == (True, [])
+        stats_dict["skewness"] = -0.75
+        assert NormalityTester.interpret_normality(stats_dict)[1] == [
+            "Skewness: -0.7500, indicating left-skewed distribution",
+        ]
+
+
+@pytest.fixture
+def real_plotting():
+    """Render with the real matplotlib (headless) and scipy.stats"""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from scipy import signal as scipy_signal  # type: ignore
+    from scipy import special as scipy_special  # type: ignore
+    from scipy import stats as scipy_stats  # type: ignore
+
+    with (
+        mock.patch.object(distribution, "plt", plt),
+        mock.patch.object(distribution, "signal", scipy_signal),
+        mock.patch.object(distribution, "special", scipy_special),
+        mock.patch.object(distribution, "stats", scipy_stats),
+    ):
+        yield plt
+    plt.close("all")
+
+
+class TestGeospatialVisualizer:
+    """Tests for the GeospatialVisualizer class"""
+
+    def test_create_distribution_plots(self, sample_data, real_plotting):
+        """Test that all four panels are drawn from matplotlib primitives"""
+        stats_dict = StatisticsCalculator.calculate_basic_stats(sample_data)
+
+        fig = GeospatialVisualizer.create_distribution_plots(
+            sample_data,
+            "test_EVI",
+            stats_dict,
+        )
+
+        histogram, qq_plot, box_plot, density = fig.axes
+        assert len(histogram.patches) == GeospatialVisualizer.HISTOGRAM_BINS
+        assert len(histogram.lines) == 3  # density curve, mean and median
+        assert box_plot.lines
+        assert density.lines
+
+        # The Q-Q plot shows every value of this small sample and a fit line
+        assert len(qq_plot.collections[0].get_offsets()) == len(sample_data)
+        assert len(qq_plot.lines) == 1
+
+    def test_distribution_figure_is_reused(self, sample_data, real_plotting):
+        """Test that one figure is redrawn for each raster instead of rebuilt"""
+        stats_dict = StatisticsCalculator.calculate_basic_stats(sample_data)
+
+        first = GeospatialVisualizer.create_distribution_plots(
+            sample_data,
+            "first",
+            stats_dict,
+        )
+        second = GeospatialVisualizer.create_distribution_plots(
+            sample_data,
+            "second",
+            stats_dict,
+        )
+
+        assert second is first
+        histogram = second.axes[0]
+        assert histogram.get_title() == "second - Histogram with Density Curve"
+        assert len(histogram.patches) == GeospatialVisualizer.HISTOGRAM_BINS
+
+        # The pooled figure is laid out even when another figure is current
+        real_plotting.figure()
+        with mock.patch.object(
+            type(first),
+            "tight_layout",
+            autospec=True,
+        ) as mock_layout:
+            GeospatialVisualizer.create_distribution_plots(
+                sample_data,
+                "again",
+                stats_dict,
+            )
+        mock_layout.assert_called_once_with(first)
+
+        # A closed figure is not reused
+        real_plotting.close("all")
+        third = GeospatialVisualizer.create_distribution_plots(
+            sample_data,
+            "third",
+            stats_dict,
+        )
+        assert third is not first
+
+    def test_save_plot_dpi(self):
+        """Test that plots are saved at the default or requested resolution"""
+        fig = mock.MagicMock()
+
+        GeospatialVisualizer.save_plot(fig, "plot.png")
+        GeospatialVisualizer.save_plot(fig, "plot.png", dpi=300)
+
+        assert fig.savefig.call_args_list == [
+            mock.call("plot.png", dpi=GeospatialVisualizer.DEFAULT_DPI),
+            mock.call("plot.png", dpi=300),
+        ]
+
+    def test_qq_points(self, sample_data, real_plotting):
+        """Test that Q-Q points pair sorted values with normal quantiles"""
+        theoretical, ordered = GeospatialVisualizer._qq_points(sample_data)
+
+        assert np.array_equal(ordered, np.sort(sample_data))
+        n = len(sample_data)
+        expected = distribution.stats.norm.ppf((np.arange(1, n + 1) - 0.5) / n)
+        assert np.allclose(theoretical, expected)
+
+        # Large inputs are subsampled
+        theoretical, ordered = GeospatialVisualizer._qq_points(sample_data, 100)
+        assert len(theoretical) == len(ordered) == 100
+        assert np.all(np.diff(ordered) >= 0)
+
+    def test_density_curve_matches_gaussian_kde(self, sample_data, real_plotting):
+        """Test that the binned FFT estimate matches scipy's exact KDE"""
+        x, density = GeospatialVisualizer._density_curve(sample_data)
+
+        exact = distribution.stats.gaussian_kde(sample_data)(x)
+        assert np.max(np.abs(density - exact)) < 0.01 * exact.max()
+        assert np.trapezoid(density, x) == pytest.approx(1, abs=0.01)
+
+    def test_create_comparison_plots_constant_data(self, real_plotting):
+        """Test that data without spread is plotted without a density curve"""
+        data = np.full(100, 0.5)
+        stats_dict = {"mean": 0.5, "median": 0.5}
+
+        fig = GeospatialVisualizer.create_comparison_plots(
+            {"EVI": data},
+            {"EVI": stats_dict},
+        )
+
+        histogram = fig.axes[0]
+        assert len(histogram.lines) == 2  # mean and median only
+
 
 class TestVegetationIndexAnalyzer:
     """Tests for the VegetationIndexAnalyzer class"""
@@ -234,6 +638,162 @@ class TestVegetationIndexAnalyzer:
             assert "percentile_75" in stats
             assert "iqr" in stats
 
+    def test_analyze_index_writes_statistics_csv(self, sample_data, tmp_path):
+        """Test that the single-row statistics CSV round-trips through pandas"""
+        analyzer = VegetationIndexAnalyzer(output_dir=str(tmp_path))
+
+        with (
+            mock.patch.object(
+                StatisticsCalculator,
+                "pixel_count",
+                return_value=len(sample_data),
+            ),
+            mock.patch.object(
+                StatisticsCalculator,
+                "load_raster_data",
+                return_value=(sample_data, None, {}),
+            ),
+            mock.patch.object(NormalityTester, "run_all_tests", return_value={}),
+            mock.patch.object(
+                NormalityTester,
+                "interpret_normality",
+                return_value=(True, []),
+            ),
+            mock.patch.object(analyzer, "visualizer"),
+        ):
+            stats = analyzer.analyze_index("test_EVI.tif")
+
+        saved = pd.read_csv(tmp_path / "test_EVI_statistics.csv")
+        assert list(saved.columns) == list(stats)
+        assert saved.loc[0, "count"] == len(sample_data)
+        assert saved.loc[0, "mean"] == pytest.approx(stats["mean"])
+
+    def test_analyze_index_csv_leaves_nan_empty(self, tmp_path):
+        """Test that undefined statistics are written as empty CSV fields"""
+        analyzer = VegetationIndexAnalyzer(output_dir=str(tmp_path))
+        constant = np.full(10, 0.5)
+
+        with (
+            mock.patch.object(StatisticsCalculator, "pixel_count", return_value=10),
+            mock.patch.object(
+                StatisticsCalculator,
+                "load_raster_data",
+                return_value=(constant, None, {}),
+            ),
+            mock.patch.object(NormalityTester, "run_all_tests", return_value={}),
+            mock.patch.object(
+                NormalityTester,
+                "interpret_normality",
+                return_value=(True, []),
+            ),
+            mock.patch.object(analyzer, "visualizer"),
+        ):
+            analyzer.analyze_index("constant_EVI.tif")
+
+        with open(tmp_path / "constant_EVI_statistics.csv", newline="") as f:
+            row = next(csv.DictReader(f))
+        assert row["skewness"] == ""
+        assert row["kurtosis"] == ""
+        assert row["mean"] == "0.5"
+
+    def test_analyze_index_streams_large_rasters(self, sample_data):
+        """Test that rasters above the pixel threshold are read block by block"""
+        analyzer = VegetationIndexAnalyzer(output_dir=None, stream_pixels=100)
+        streamed = {"mean": 5.0}
+
+        with (
+            mock.patch.object(StatisticsCalculator, "pixel_count", return_value=101),
+            mock.patch.object(
+                StatisticsCalculator,
+                "stream_stats",
+                return_value=(streamed, sample_data),
+            ) as mock_stream,
+            mock.patch.object(StatisticsCalculator, "load_raster_data") as mock_load,
+            mock.patch.object(
+                NormalityTester,
+                "run_all_tests",
+                return_value={},
+            ) as mock_tests,
+            mock.patch.object(
+                NormalityTester,
+                "interpret_normality",
+                return_value=(True, []),
+            ),
+            mock.patch.object(VegetationIndexAnalyzer, "_print_analysis_results"),
+        ):
+            stats = analyzer.analyze_index("large_EVI.tif")
+
+        # Verify the whole band was never loaded and the sample was tested
+        mock_stream.assert_called_once_with(
+            "large_EVI.tif",
+            sample_size=distribution.COMPARISON_SAMPLE_SIZE,
+        )
+        mock_load.assert_not_called()
+        mock_tests.assert_called_once_with(sample_data)
+        assert stats == streamed
+
+    def test_analyze_index_reuses_cached_analysis(self, sample_data, tmp_path):
+        """Test that an unchanged raster is not analyzed again"""
+        raster = tmp_path / "test_EVI.tif"
+        raster.write_bytes(b"raster")
+        output_dir = tmp_path / "statistics"
+        analyzer = VegetationIndexAnalyzer(output_dir=str(output_dir), use_cache=True)
+
+        with (
+            mock.patch.object(
+                StatisticsCalculator,
+                "pixel_count",
+                return_value=len(sample_data),
+            ),
+            mock.patch.object(
+                StatisticsCalculator,
+                "load_raster_data",
+                return_value=(sample_data, None, {}),
+            ) as mock_load,
+            mock.patch.object(
+                NormalityTester,
+                "run_all_tests",
+                return_value={"shapiro_p_value": 0.5},
+            ),
+            mock.patch.object(
+                NormalityTester,
+                "interpret_normality",
+                return_value=(True, []),
+            ),
+            mock.patch.object(analyzer, "visualizer") as mock_visualizer,
+        ):
+            mock_visualizer.save_plot.side_effect = lambda fig, path, dpi: Path(
+                path,
+            ).touch()
+
+            first = analyzer.analyze_index(str(raster))
+            second = analyzer.analyze_index(str(raster))
+            assert mock_load.call_count == 1
+            assert second == first
+
+            # Rewriting the raster invalidates the cache
+            raster.write_bytes(b"updated raster")
+            analyzer.analyze_index(str(raster))
+            assert mock_load.call_count == 2
+
+            # So does removing the outputs written with it
+            (output_dir / "test_EVI_statistics.csv").unlink()
+            analyzer.analyze_index(str(raster))
+            assert mock_load.call_count == 3
+
+            # So does changing a setting that affects the outputs
+            analyzer.plot_dpi = 300
+            analyzer.analyze_index(str(raster))
+            assert mock_load.call_count == 4
+            analyzer.analyze_index(str(raster))
+            assert mock_load.call_count == 4
+
+            # Caching is opt-in
+            uncached = VegetationIndexAnalyzer(output_dir=str(output_dir))
+            uncached.visualizer = mock_visualizer
+            uncached.analyze_index(str(raster))
+            assert mock_load.call_count == 5
+
     def test_compare_indices(self, mock_analyzer):
         """Test comparing multiple vegetation indices"""
         # Mock the compare_indices method to return a mock DataFrame
@@ -260,3 +820,147 @@ class TestVegetationIndexAnalyzer:
             assert comparison.shape == (2, 3)
             assert all(idx in comparison.index for idx in ["EVI", "LAI"])
             assert all(col in comparison.columns for col in ["mean", "median", "std"])
+
+    def test_compare_indices_analyzes_each_file(self, mock_analyzer):
+        """Test that every raster is loaded and summarized by the workers"""
+        rasters = {
+            "evi.tif": np.array([0.1, 0.2, 0.3]),
+            "lai.tif": np.array([1.0, 2.0, 3.0, 4.0]),
+        }
+
+        with (
+            # Any total pixel count is large enough for the worker pool
+            mock.patch.object(mock_analyzer, "POOL_PIXEL_THRESHOLD", 0),
+            # Threads stand in for processes so the patched loader is used
+            mock.patch.object(
+                distribution,
+                "ProcessPoolExecutor",
+                side_effect=lambda max_workers, mp_context: ThreadPoolExecutor(
+                    max_workers,
+                ),
+            ) as mock_pool,
+            mock.patch.object(
+                StatisticsCalculator,
+                "pixel_count",
+                side_effect=lambda path: rasters[path].size,
+            ),
+            mock.patch.object(
+                StatisticsCalculator,
+                "load_raster_data",
+                side_effect=lambda path: (rasters[path], None, {}),
+            ),
+        ):
+            comparison = mock_analyzer.compare_indices(
+                {"EVI": "evi.tif", "LAI": "lai.tif"},
+            )
+
+        assert list(comparison.index) == ["EVI", "LAI"]
+        assert list(comparison.columns) == list(StatisticsCalculator.STAT_NAMES)
+        assert comparison["count"].dtype == np.int64
+        assert comparison.loc["EVI", "count"] == 3
+        assert comparison.loc["LAI", "mean"] == pytest.approx(2.5)
+
+        # Workers are spawned, never forked from a threaded process
+        mp_context = mock_pool.call_args.kwargs["mp_context"]
+        assert mp_context.get_start_method() == "spawn"
+
+    @pytest.mark.parametrize(
+        "rasters",
+        [
+            # A single raster, however large
+            {"evi.tif": np.array([0.1, 0.2, 0.3])},
+            # Rasters whose total pixel count is below the threshold
+            {"evi.tif": np.array([0.1, 0.2]), "lai.tif": np.array([1.0, 2.0])},
+        ],
+    )
+    def test_compare_indices_inline(self, mock_analyzer, rasters):
+        """Test that small inputs are analyzed without a worker pool"""
+        with (
+            mock.patch.object(distribution, "ProcessPoolExecutor") as mock_pool,
+            mock.patch.object(
+                StatisticsCalculator,
+                "pixel_count",
+                side_effect=lambda path: rasters[path].size,
+            ),
+            mock.patch.object(
+                StatisticsCalculator,
+                "load_raster_data",
+                side_effect=lambda path: (rasters[path], None, {}),
+            ),
+        ):
+            comparison = mock_analyzer.compare_indices(
+                {path.split(".")[0].upper(): path for path in rasters},
+            )
+
+        mock_pool.assert_not_called()
+        assert list(comparison["count"]) == [data.size for data in rasters.values()]
+
+    @pytest.mark.parametrize(
+        ("file_name", "index_name"),
+        [
+            ("rs_metrics_finland_20240401_LAI", "LAI"),
+            # The pipeline's suffix wins over an index name in the area name
+            ("rs_metrics_laitila_20240401_EVI", "EVI"),
+            ("EVI", "EVI"),
+            ("evi_summer", "EVI"),
+            ("rs_metrics_finland_20240401_msi", "MSI"),
+            ("MSI_2024", "MSI"),
+            # Elsewhere in the name, MSI takes precedence over LAI over EVI
+            ("evi_lai_ratio", "LAI"),
+            ("rs_metrics_finland_20240401_NDVI", None),
+        ],
+    )
+    def test_print_analysis_results_index_context(self, capsys, file_name, index_name):
+        """Test that the context of the index named in the file is printed"""
+        stats_dict = dict.fromkeys(
+            ["mean", "median", "std", "skewness", "kurtosis"],
+            0.0,
+        )
+
+        VegetationIndexAnalyzer._print_analysis_results(file_name, stats_dict, True, [])
+
+        context = capsys.readouterr().out.split("Vegetation Index Context:\n")[1]
+        expected = VegetationIndexAnalyzer.INDEX_CONTEXT.get(index_name, ())
+        assert context.splitlines() == list(expected)
+
+    def test_print_comparison_results_typical_ranges(self, capsys):
+        """Test that the typical ranges of common indices are always printed"""
+        stats_df = pd.DataFrame({"mean": [1.0]}, index=["NDWI"])
+
+        VegetationIndexAnalyzer._print_comparison_results(stats_df)
+
+        output = capsys.readouterr().out
+        assert output.endswith(
+            "\nTypical ranges for vegetation indices:\n"
+            "- LAI: 0-8 m²/m² (most natural vegetation: 0.5-5)\n"
+            "- EVI: -1 to +1 (healthy vegetation: 0.2-0.8)\n"
+            "- MSI: 0.4-2 (lower values indicate less water stress)\n",
+        )
+
+    def test_print_analysis_results_summary(self, capsys):
+        """Test that the summary statistics are printed to four decimals"""
+        stats_dict = {
+            "mean": 0.5,
+            "median": 0.25,
+            "std": 1.0,
+            "skewness": -0.125,
+            "kurtosis": 3.0,
+        }
+
+        VegetationIndexAnalyzer._print_analysis_results(
+            "evi",
+            stats_dict,
+            False,
+            ["Shapiro-Wilk test rejected normality"],
+        )
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[1:7] == [
+            "=== Distribution Analysis Results ===",
+            "Mean: 0.5000",
+            "Median: 0.2500",
+            "Standard Deviation: 1.0000",
+            "Skewness: -0.1250",
+            "Kurtosis: 3.0000",
+        ]
+        assert "- Shapiro-Wilk test rejected normality" in lines